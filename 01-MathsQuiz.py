@@ -1,42 +1,91 @@
 from tkinter import *
 from tkinter import ttk
+from array import array
+import argparse
+import asyncio
 import random
-
-class MathQuizApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Math Quiz")
-        self.root.geometry("600x500")  # Set window size (portrait)
-
-        # Game control variables
-        self.game_state = 'menu'  
-        self.difficulty = 'easy'
-        self.problems = []  # Stores generated math problems
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for bulk worksheet generation
+    np = None
+
+RANGES = {'easy': (1, 9), 'moderate': (10, 99), 'advanced': (1000, 9999)}
+QUESTIONS = 10  # Problems per quiz
+SHEET_CHUNK = 100_000  # Worksheets drawn per batch; part of what a seed reproduces
+QUIZ_PORT = 8765
+RANKS = [(95, 'A+'), (90, 'A'), (85, 'B+'), (80, 'B'), (75, 'C+'), (70, 'C')]
+
+class QuizState:
+    # Scoring and progress rules shared by every kind of quiz. Subclasses say where
+    # the problems live through problem_count() and current_answer()
+    __slots__ = ('current_index', 'attempts', 'score')
+
+    def __init__(self):
         self.current_index = 0
         self.attempts = 0
         self.score = 0
 
-        # Tkinter variables for text and entry fields
-        self.user_answer = StringVar()
-        self.message = StringVar()
-        self.show_result = False  # Controls button/entry states
+    def answer(self, text):
+        # Scores a typed answer. Returns (result, points), result being 'empty',
+        # 'invalid', 'correct', 'retry' (first miss) or 'wrong' (second miss)
+        if not text.strip():
+            return 'empty', 0
+        try:
+            user_num = int(text)
+        except ValueError:  # Handles non-numeric input
+            return 'invalid', 0
 
-        self.create_menu()  # Start with menu screen
+        if user_num == self.current_answer():
+            # Full points if first try, half if second try
+            points = 10 if self.attempts == 0 else 5
+            self.score += points
+            return 'correct', points
+        # Allow one retry before showing correct answer
+        if self.attempts == 0:
+            self.attempts = 1
+            return 'retry', 0
+        return 'wrong', 0
+
+    def advance(self):
+        # Moves to the next problem; False once the quiz is over
+        self.attempts = 0
+        if self.current_index < self.problem_count() - 1:
+            self.current_index += 1
+            return True
+        return False
+
+    @staticmethod
+    def rank(score):
+        # Converts numeric score to letter grade
+        for minimum, grade in RANKS:
+            if score >= minimum:
+                return grade
+        return 'F'
+
+class QuizEngine(QuizState):
+    # Quiz rules and state without any Tk, so quizzes can be generated, played
+    # and scored headless. The same seed always gives the same problems
+    def __init__(self, seed=None):
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed) if np is not None else None
+        self.difficulty = 'easy'
+        self.problems = []  # Stores generated math problems
 
     def random_int(self, min_val, max_val):
-        return random.randint(min_val, max_val)
+        return self.rng.randint(min_val, max_val)
 
     def decide_operation(self):
-        return '+' if random.random() > 0.5 else '-'  # Randomly pick + or -
+        return '+' if self.rng.random() > 0.5 else '-'  # Randomly pick + or -
 
-    def generate_problems(self, diff):
-        # Set number ranges for each difficulty level
-        ranges = {'easy': [1, 9], 'moderate': [10, 99], 'advanced': [1000, 9999]}
-        min_val, max_val = ranges[diff]
+    def generate_problems(self, diff, count=QUESTIONS):
+        min_val, max_val = RANGES[diff]
         problems = []
 
-        # Create 10 random math problems
-        for _ in range(10):
+        for _ in range(count):
             num1 = self.random_int(min_val, max_val)
             num2 = self.random_int(min_val, max_val)
             operation = self.decide_operation()
@@ -44,74 +93,205 @@ class MathQuizApp:
             problems.append({'num1': num1, 'num2': num2, 'operation': operation, 'answer': answer})
         return problems
 
-    def start_quiz(self, diff):
+    def generate_batch(self, diff, count):
+        # Any number of problems at once as NumPy arrays: operands, operators ('+'/'-')
+        # and answers
+        min_val, max_val = RANGES[diff]
+        num1 = self.np_rng.integers(min_val, max_val + 1, count)
+        num2 = self.np_rng.integers(min_val, max_val + 1, count)
+        plus = self.np_rng.random(count) > 0.5
+        return num1, num2, np.where(plus, '+', '-'), np.where(plus, num1 + num2, num1 - num2)
+
+    def iter_worksheets(self, diff, sheets, per_sheet=QUESTIONS, chunk=SHEET_CHUNK):
+        # Worksheets in chunks of up to `chunk` sheets, each array shaped (sheets, per_sheet)
+        for start in range(0, sheets, chunk):
+            n = min(chunk, sheets - start)
+            yield tuple(a.reshape(n, per_sheet) for a in self.generate_batch(diff, n * per_sheet))
+
+    @staticmethod
+    def check_batch(diff, num1, num2, ops, answers, sample=1000):
+        # Number of bad problems. Operands and operators of every problem are range-checked
+        # in bulk; answers are worked out again one problem at a time in plain Python, the
+        # way generate_problems does, for `sample` random problems (all when sample is None)
+        min_val, max_val = RANGES[diff]
+        bad = (num1 < min_val) | (num1 > max_val) | (num2 < min_val) | (num2 > max_val)
+        bad |= (ops != '+') & (ops != '-')
+        bad = bad.reshape(-1)
+        num1, num2, ops, answers = (a.reshape(-1) for a in (num1, num2, ops, answers))
+        if sample is None or sample >= answers.size:
+            rows = range(answers.size)
+        else:
+            rows = random.sample(range(answers.size), sample)
+        for i in rows:
+            a, b = int(num1[i]), int(num2[i])
+            if int(answers[i]) != (a + b if ops[i] == '+' else a - b):
+                bad[i] = True
+        return int(bad.sum())
+
+    def start(self, diff):
         # Reset quiz state and generate new problems
         self.difficulty = diff
         self.problems = self.generate_problems(diff)
-        self.game_state = 'playing'
         self.current_index = 0
         self.score = 0
         self.attempts = 0
+
+    @property
+    def problem(self):
+        return self.problems[self.current_index]
+
+    def problem_count(self):
+        return len(self.problems)
+
+    def current_answer(self):
+        return self.problem['answer']
+
+class QuizSession(QuizState):
+    # One player's quiz on the server, kept small: the problems are packed into an
+    # int array as (num1, num2, answer) triples. Operands are never 0, so the
+    # operator follows from the answer
+    __slots__ = ('numbers',)
+
+    def __init__(self, problems):
+        super().__init__()
+        self.numbers = array('i', [n for p in problems for n in (p['num1'], p['num2'], p['answer'])])
+
+    def problem_count(self):
+        return len(self.numbers) // 3
+
+    def current_answer(self):
+        return self.numbers[self.current_index * 3 + 2]
+
+    def question(self):
+        num1, num2, answer = self.numbers[self.current_index * 3:self.current_index * 3 + 3]
+        return f"{self.current_index + 1}/{self.problem_count()} {num1} {'+' if answer == num1 + num2 else '-'} {num2} ="
+
+class QuizServer:
+    # Hosts many quizzes over a line-based TCP protocol, one command per line:
+    #   NEW <difficulty>      -> OK <id> <n>/<total> <question>
+    #   ANSWER <id> <answer>  -> <RESULT> <points> <score> [NEXT <n>/<total> <question> | DONE <grade>]
+    #   QUIT <id>             -> BYE
+    # RESULT is the upper-cased QuizState.answer result; bad commands get "ERR <reason>".
+    # Sessions belong to the connection that started them and end with it
+    def __init__(self, seed=None):
+        self.engine = QuizEngine(seed)
+        self.sessions = {}  # id -> QuizSession
+        self.next_id = 1
+        self.peak = 0  # Most sessions alive at once
+
+    def command(self, parts, owned):
+        if parts[0] == 'NEW' and len(parts) == 2 and parts[1] in RANGES:
+            session_id = self.next_id
+            self.next_id += 1
+            session = self.sessions[session_id] = QuizSession(self.engine.generate_problems(parts[1]))
+            owned.add(session_id)
+            self.peak = max(self.peak, len(self.sessions))
+            return f"OK {session_id} {session.question()}"
+        # isdigit() alone also passes digits like '²' that int() rejects
+        if parts[0] in ('ANSWER', 'QUIT') and len(parts) >= 2 and parts[1].isascii() and parts[1].isdigit():
+            session_id = int(parts[1])
+            if session_id not in owned:
+                return "ERR unknown session"
+            if parts[0] == 'QUIT':
+                owned.discard(session_id)
+                del self.sessions[session_id]
+                return "BYE"
+            session = self.sessions[session_id]
+            result, points = session.answer(parts[2] if len(parts) == 3 else '')
+            reply = f"{result.upper()} {points} {session.score}"
+            if result in ('correct', 'wrong'):
+                if session.advance():
+                    return f"{reply} NEXT {session.question()}"
+                owned.discard(session_id)
+                del self.sessions[session_id]
+                return f"{reply} DONE {QuizState.rank(session.score)}"
+            return reply
+        return "ERR bad command"
+
+    async def handle(self, reader, writer):
+        owned = set()
+        try:
+            while line := await reader.readline():
+                parts = line.decode(errors='replace').split(maxsplit=2)
+                if parts:
+                    writer.write((self.command(parts, owned) + "\n").encode())
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                del self.sessions[session_id]
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=QUIZ_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+class MathQuizApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Math Quiz")
+        self.root.geometry("600x500")  # Set window size (portrait)
+
+        # Game control variables
+        self.game_state = 'menu'  
+        self.engine = QuizEngine()
+
+        # Tkinter variables for text and entry fields
+        self.user_answer = StringVar()
+        self.message = StringVar()
+        self.show_result = False  # Controls button/entry states
+
+        # Each screen is built once and kept; later visits only update these variables
+        self.screens = {}
+        self.current_screen = None
+        self.question_text = StringVar()
+        self.progress_text = StringVar()
+        self.progress_value = DoubleVar()
+        self.score_text = StringVar()
+        self.final_score = StringVar()
+        self.grade_text = StringVar()
+
+        self.create_menu()  # Start with menu screen
+
+    def start_quiz(self, diff):
+        self.engine.start(diff)
+        self.game_state = 'playing'
         self.user_answer.set('')
         self.message.set('')
         self.show_result = False
         self.create_playing()  # Load playing screen
 
     def check_answer(self):
-        if not self.user_answer.get().strip():  # Empty input
-            return
+        result, points = self.engine.answer(self.user_answer.get())
 
-        problem = self.problems[self.current_index]
-        try:
-            user_num = int(self.user_answer.get())
-        except ValueError:  # Handles non-numeric input
-            self.message.set('Invalid input')
+        if result == 'empty':
             return
-
-        is_correct = user_num == problem['answer']
-
-        if is_correct:
-            # Full points if first try, half if second try
-            points = 10 if self.attempts == 0 else 5
-            self.score += points
+        if result == 'invalid':
+            self.message.set('Invalid input')
+        elif result == 'correct':
             self.message.set(f'✓ Correct! +{points} points')
             self.show_result = True
             self.root.after(1500, self.next_problem)  # Move to next after delay
+        elif result == 'retry':
+            self.message.set('✗ Incorrect, Try again!')
+            self.user_answer.set('')
+            self.show_result = False
         else:
-            # Allow one retry before showing correct answer
-            if self.attempts == 0:
-                self.attempts = 1
-                self.message.set('✗ Incorrect, Try again!')
-                self.user_answer.set('')
-                self.show_result = False
-            else:
-                self.message.set(f'✗ Wrong! Answer: {problem["answer"]}')
-                self.show_result = True
-                self.root.after(1500, self.next_problem)
+            self.message.set(f'✗ Wrong! Answer: {self.engine.problem["answer"]}')
+            self.show_result = True
+            self.root.after(1500, self.next_problem)
 
     def next_problem(self):
         # Prepare next question or go to results
         self.show_result = False
         self.user_answer.set('')
-        self.attempts = 0
         self.message.set('')
-        if self.current_index < 9:
-            self.current_index += 1
+        if self.engine.advance():
             self.create_playing()
         else:
             self.game_state = 'results'
             self.create_results()
 
-    def get_rank(self, score):
-        # Converts numeric score to letter grade
-        if score >= 95: return 'A+'
-        elif score >= 90: return 'A'
-        elif score >= 85: return 'B+'
-        elif score >= 80: return 'B'
-        elif score >= 75: return 'C+'
-        elif score >= 70: return 'C'
-        else: return 'F'
-
     def play_again(self):
         self.game_state = 'menu'
         self.create_menu()  # Return to menu screen
@@ -123,13 +303,22 @@ class MathQuizApp:
         else:
             self.submit_btn.config(state='disabled')
 
+    def show_screen(self, name, build):
+        # Swap to a screen, building its widgets on the first visit only
+        if name not in self.screens:
+            self.screens[name] = build()
+        if self.current_screen != name:
+            if self.current_screen:
+                self.screens[self.current_screen].pack_forget()
+            self.screens[name].pack(fill=BOTH, expand=True)
+            self.current_screen = name
+
     def create_menu(self):
-        # Clears screen and shows main menu
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # Shows main menu
+        self.show_screen('menu', self.build_menu)
 
+    def build_menu(self):
         main_frame = Frame(self.root, bg='#e0f2fe')
-        main_frame.pack(fill=BOTH, expand=True)
 
         Label(main_frame, text="Math Quiz", font=("Arial", 36, "bold"),
               bg='#e0f2fe', fg="#000000").pack(pady=20)
@@ -149,57 +338,63 @@ class MathQuizApp:
             btn.pack(pady=5, ipadx=20, ipady=10)
             btn.bind("<Enter>", lambda e, b=btn: b.config(bg='#e3f2fd'))
             btn.bind("<Leave>", lambda e, b=btn: b.config(bg='white'))
+        return main_frame
 
     def create_playing(self):
-        # Clears screen and shows quiz question
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # Shows quiz question
+        engine = self.engine
+        problem = engine.problem
+        self.progress_text.set(f"Question {engine.current_index + 1}/{len(engine.problems)}")
+        self.progress_value.set(((engine.current_index + 1) / len(engine.problems)) * 100)
+        self.question_text.set(f"{problem['num1']} {problem['operation']} {problem['num2']} =")
+        self.score_text.set(f"Score: {engine.score}")
+        self.show_screen('playing', self.build_playing)
+        self.entry.config(state='normal' if not self.show_result else 'disabled')
+        self.entry.focus()
+        self.update_submit_button()
 
+    def build_playing(self):
         main_frame = Frame(self.root, bg='#f3e5f5')
-        main_frame.pack(fill=BOTH, expand=True)
 
         # Progress bar and question number
         progress_frame = Frame(main_frame, bg='#f3e5f5')
         progress_frame.pack(pady=10)
 
-        Label(progress_frame, text=f"Question {self.current_index + 1}/10",
+        Label(progress_frame, textvariable=self.progress_text,
               font=("Arial", 10), bg='#f3e5f5', fg='#546e7a').pack()
 
-        progress = ttk.Progressbar(progress_frame, orient="horizontal", length=300, mode="determinate")
-        progress['value'] = ((self.current_index + 1) / 10) * 100
-        progress.pack()
+        ttk.Progressbar(progress_frame, orient="horizontal", length=300, mode="determinate",
+                        variable=self.progress_value).pack()
 
         # Display math question
-        problem = self.problems[self.current_index]
-        Label(main_frame, text=f"{problem['num1']} {problem['operation']} {problem['num2']} =",
+        Label(main_frame, textvariable=self.question_text,
               font=("Arial", 24, "bold"), bg='#f3e5f5', fg='#37474f').pack(pady=20)
 
         # Answer input field
-        entry = Entry(main_frame, textvariable=self.user_answer, font=("Arial", 16),
-                      justify='center', state='normal' if not self.show_result else 'disabled')
-        entry.pack(pady=10, ipadx=10, ipady=5)
-        entry.focus()
-        entry.bind('<Return>', lambda e: self.check_answer())
-        entry.bind('<KeyRelease>', self.update_submit_button)
+        self.entry = Entry(main_frame, textvariable=self.user_answer, font=("Arial", 16), justify='center')
+        self.entry.pack(pady=10, ipadx=10, ipady=5)
+        self.entry.bind('<Return>', lambda e: self.check_answer())
+        self.entry.bind('<KeyRelease>', self.update_submit_button)
 
         # Submit button
         self.submit_btn = Button(main_frame, text="Submit", font=("Arial", 14, "bold"),
                                  bg='#1976d2', fg='white', command=self.check_answer, state='disabled')
         self.submit_btn.pack(pady=10, ipadx=20, ipady=5)
-        self.update_submit_button()
 
         # Feedback message and score display
         Label(main_frame, textvariable=self.message, font=("Arial", 14, "bold"), bg='#f3e5f5').pack(pady=10)
-        Label(main_frame, text=f"Score: {self.score}", font=("Arial", 10),
+        Label(main_frame, textvariable=self.score_text, font=("Arial", 10),
               bg='#f3e5f5', fg='#546e7a').pack()
+        return main_frame
 
     def create_results(self):
         # Final results screen
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.final_score.set(f"{self.engine.score}/{len(self.engine.problems) * 10}")
+        self.grade_text.set(f"Grade: {QuizEngine.rank(self.engine.score)}")
+        self.show_screen('results', self.build_results)
 
+    def build_results(self):
         main_frame = Frame(self.root, bg='#e8f5e8')
-        main_frame.pack(fill=BOTH, expand=True)
 
         result_frame = Frame(main_frame, bg='white', bd=2, relief='solid')
         result_frame.pack(pady=50, padx=50, fill=BOTH, expand=True)
@@ -207,19 +402,164 @@ class MathQuizApp:
         Label(result_frame, text="Quiz Complete!", font=("Arial", 28, "bold"),
               bg='white', fg='#37474f').pack(pady=20)
 
-        Label(result_frame, text=f"{self.score}/100", font=("Arial", 48, "bold"),
+        Label(result_frame, textvariable=self.final_score, font=("Arial", 48, "bold"),
               bg='white', fg='#1976d2').pack(pady=10)
 
         # Display letter grade
-        rank = self.get_rank(self.score)
-        Label(result_frame, text=f"Grade: {rank}", font=("Arial", 36, "bold"),
+        Label(result_frame, textvariable=self.grade_text, font=("Arial", 36, "bold"),
               bg='white', fg='#3f51b5').pack(pady=20)
 
         # Restart button
         Button(result_frame, text="Play Again", font=("Arial", 16, "bold"),
                bg='#1976d2', fg='white', command=self.play_again).pack(pady=20, ipadx=20, ipady=10)
+        return main_frame
 
-if __name__ == "__main__":
+def count_widgets(widget):
+    # Widgets under (and including) widget
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+def benchmark_transitions(sessions=200):
+    # Plays whole quizzes through the real screens, answering instantly, and reports
+    # the time per screen transition and how many Tk objects are alive as it goes
     root = Tk()
     app = MathQuizApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.update()
+    times = []
+
+    def timed(action, *args):
+        start = time.perf_counter()
+        action(*args)
+        root.update_idletasks()  # Include the geometry and redraw work
+        times.append((time.perf_counter() - start) * 1000)
+
+    for session in range(1, sessions + 1):
+        timed(app.start_quiz, 'easy')
+        for _ in range(QUESTIONS):
+            app.show_result = True  # As after an answer, without the 1.5 s after() delay
+            timed(app.next_problem)
+        timed(app.play_again)
+        root.update()
+        if session == 1 or session % 50 == 0:
+            print(f"after {session:4} sessions: {count_widgets(root):3} widgets, "
+                  f"{len(root.tk.call('info', 'commands')):4} Tcl commands")
+
+    times.sort()
+    print(f"{len(times)} transitions: mean {sum(times) / len(times):.2f} ms, "
+          f"p95 {times[int(len(times) * 0.95)]:.2f} ms, max {times[-1]:.2f} ms")
+    root.destroy()
+
+def generate_worksheets(diff, sheets, seed=None, sample=1000):
+    # Generates and checks `sheets` worksheets in chunks, recomputing the answers of `sample`
+    # problems per chunk (all when None); returns (problems, bad, answers recomputed, answer checksum)
+    engine = QuizEngine(seed)
+    problems = bad = checked = checksum = 0
+    for num1, num2, ops, answers in engine.iter_worksheets(diff, sheets):
+        problems += answers.size
+        bad += QuizEngine.check_batch(diff, num1, num2, ops, answers, sample)
+        checked += answers.size if sample is None else min(sample, answers.size)
+        checksum += int(answers.sum())
+    return problems, bad, checked, checksum
+
+async def quiz_client(host, port, quizzes, parallel, difficulty, latencies, rng):
+    # One connection playing `quizzes` quizzes, `parallel` of them at a time, answering
+    # each question in turn; about one answer in five is wrong to exercise retries
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def ask(line):
+        start = time.perf_counter()
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        reply = (await reader.readline()).decode().split()
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    remaining = quizzes
+    while remaining:
+        playing = {}  # session id -> [num1, op, num2]
+        for _ in range(min(parallel, remaining)):
+            reply = await ask(f"NEW {difficulty}")
+            playing[reply[1]] = reply[3:6]
+        remaining -= len(playing)
+        while playing:
+            for session_id, (num1, op, num2) in list(playing.items()):
+                answer = int(num1) + int(num2) if op == '+' else int(num1) - int(num2)
+                if rng.random() < 0.2:
+                    answer += 1
+                reply = await ask(f"ANSWER {session_id} {answer}")
+                if len(reply) > 3 and reply[3] == 'DONE':
+                    del playing[session_id]
+                elif len(reply) > 3:
+                    playing[session_id] = reply[5:8]
+    writer.close()
+    await writer.wait_closed()
+
+async def load_test(sessions, clients, parallel, difficulty, host, port):
+    # Plays `sessions` quizzes from `clients` connections, using a server already on
+    # host:port or else one started in this process
+    server = None
+    try:
+        probe = (await asyncio.open_connection(host, port))[1]
+        probe.close()
+    except OSError:
+        quiz_server = QuizServer()
+        server = await quiz_server.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    latencies = []
+    rng = random.Random(1)
+    start = time.perf_counter()
+    await asyncio.gather(*(quiz_client(host, port, sessions // clients + (i < sessions % clients),
+                                       parallel, difficulty, latencies, rng) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{sessions:,} quizzes from {clients} connections ({parallel} at a time each) in {elapsed:.2f}s: "
+          f"{sessions / elapsed:,.0f} sessions/s, {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    if server:
+        session = QuizSession(quiz_server.engine.generate_problems(difficulty))
+        size = sys.getsizeof(session) + sys.getsizeof(session.numbers)
+        print(f"peak live sessions {quiz_server.peak:,}, {size} bytes of state each")
+        server.close()
+        await server.wait_closed()
+
+async def serve(port):
+    server = await QuizServer().start('127.0.0.1', port)
+    print(f"Quiz server on 127.0.0.1:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Math Quiz")
+    parser.add_argument('--bench-screens', action='store_true', help="time screen transitions and exit")
+    parser.add_argument('--worksheets', type=int, metavar='N', help="generate and check N worksheets without the GUI")
+    parser.add_argument('--difficulty', choices=sorted(RANGES), default='easy', help="difficulty for --worksheets")
+    parser.add_argument('--seed', type=int, help="seed for reproducible worksheets")
+    parser.add_argument('--check-all', action='store_true', help="recompute every answer, not a sample per chunk")
+    parser.add_argument('--serve', action='store_true', help="run the multi-session quiz server")
+    parser.add_argument('--port', type=int, default=QUIZ_PORT, help="port for --serve and --load-test")
+    parser.add_argument('--load-test', type=int, metavar='SESSIONS', help="play SESSIONS quizzes against the server")
+    parser.add_argument('--clients', type=int, default=100, help="connections used by --load-test")
+    parser.add_argument('--parallel', type=int, default=10, help="quizzes each --load-test connection plays at once")
+    args = parser.parse_args()
+    if args.bench_screens:
+        benchmark_transitions()
+    elif args.serve:
+        asyncio.run(serve(args.port))
+    elif args.load_test:
+        asyncio.run(load_test(args.load_test, args.clients, args.parallel, args.difficulty, '127.0.0.1', args.port))
+    elif args.worksheets:
+        if np is None:
+            parser.error("--worksheets needs NumPy (pip install numpy)")
+        start = time.perf_counter()
+        problems, bad, checked, checksum = generate_worksheets(args.difficulty, args.worksheets, args.seed,
+                                                               None if args.check_all else 1000)
+        elapsed = time.perf_counter() - start
+        print(f"{args.worksheets:,} {args.difficulty} worksheets ({problems:,} problems) in {elapsed:.2f}s, "
+              f"{args.worksheets / elapsed:,.0f} worksheets/s")
+        answers = "all answers" if checked == problems else f"answers of {checked:,} sampled problems"
+        print(f"invalid problems: {bad} (ranges and operators checked for all, {answers} recomputed), "
+              f"answer checksum: {checksum}")
+    else:
+        root = Tk()
+        app = MathQuizApp(root)
+        root.mainloop()
\ No newline at end of file
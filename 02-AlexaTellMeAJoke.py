@@ -1,19 +1,227 @@
 from tkinter import *
+from array import array
+import hashlib
+import mmap
+import os
 import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+JOKES_FILE = 'randomJokes.txt'
+INDEX_HEADER = struct.Struct('=4sIQQQQ')  # magic, version, bytes indexed, jokes indexed, fingerprint, build id
+INDEX_MAGIC = b'JKIX'
+INDEX_VERSION = 2
+RECORD_SIZE = 32  # Four uint64 per joke
+BAG_HEADER = struct.Struct('=4sIQQQ')  # magic, version, index build id, jokes covered, cursor
+BAG_MAGIC = b'JKBG'
+BAG_VERSION = 1
 
 def load_jokes(filename): # Load Jokes from txt file
     with open(filename, 'r', encoding='utf-8') as f:
         return [line.strip() for line in f if line.strip()]
 
+# Random access to a joke file of any size without reading it into memory. A persisted
+# index (<file>.idx) holds one (start, setup length, length, content hash) record per
+# joke, as byte offsets, so the setup/punchline split is worked out once. Repeated
+# jokes are left out of the index by their hash. Only newline-terminated lines are
+# indexed: when the file grows, the new lines are appended to the index, and an
+# unterminated last line is parsed each time the file is opened. A full rebuild
+# renumbers the jokes and gets a new build id
+class JokeStore:
+    def __init__(self, filename, index_path=None):
+        self.filename = filename
+        self.index_path = index_path or filename + '.idx'
+        self.size = -1  # Size of the joke file when last mapped
+        self.source = self.index_map = self.records = None
+        self.count = 0  # Jokes in the index
+        self.build_id = 0
+        self.tail = array('Q')  # Record for an unterminated last line, if any
+        self.refresh()
+
+    def __len__(self):
+        return self.count + len(self.tail) // 4
+
+    @staticmethod
+    def fingerprint(data, end): # Checksum of the start and end of the indexed part
+        return zlib.crc32(data[:min(4096, end)] + data[max(0, end - 4096):end])
+
+    @staticmethod
+    def scan(data, pos, end, seen): # Index records for the jokes between two offsets not already in seen
+        records = array('Q')
+        while pos < end:
+            newline = data.find(b'\n', pos, end)
+            if newline < 0:
+                newline = end
+            line = data[pos:newline]
+            joke = line.strip()
+            if joke:
+                digest = int.from_bytes(hashlib.blake2b(joke, digest_size=8).digest(), 'little')
+                if digest not in seen:  # Only hashes are kept, so memory follows the unique jokes
+                    seen.add(digest)
+                    split = joke.find(b'?') + 1 or len(joke)  # Setup keeps its '?'
+                    records.extend((pos + len(line) - len(line.lstrip()), split, len(joke), digest))
+            pos = newline + 1
+        return records
+
+    @staticmethod
+    def hashes(records): # Content hashes in a run of index records
+        return set(records[3::4])
+
+    def update_index(self, data, end): # Bring the index file up to date with data[:end]
+        try:
+            with open(self.index_path, 'r+b') as f:
+                magic, version, indexed, count, fingerprint, build_id = INDEX_HEADER.unpack(
+                    f.read(INDEX_HEADER.size))
+                if (magic, version) == (INDEX_MAGIC, INDEX_VERSION) and indexed <= end \
+                        and fingerprint == self.fingerprint(data, indexed):
+                    if indexed < end:  # File grew: index only the new lines
+                        known = array('Q')
+                        known.fromfile(f, count * 4)
+                        records = self.scan(data, indexed, end, self.hashes(known))
+                        del known
+                        f.seek(INDEX_HEADER.size + count * RECORD_SIZE)
+                        records.tofile(f)
+                        f.truncate()
+                        f.flush()
+                        os.fsync(f.fileno())  # Records are on disk before the header counts them
+                        f.seek(0)
+                        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, end, count + len(records) // 4,
+                                                  self.fingerprint(data, end), build_id))
+                    return
+        except (OSError, EOFError, struct.error):
+            pass
+        # Missing, damaged or for a rewritten file: build it again and swap it in
+        records = self.scan(data, 0, end, set())
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, end, len(records) // 4,
+                                      self.fingerprint(data, end), int.from_bytes(os.urandom(8), 'little')))
+            records.tofile(f)
+        os.replace(tmp, self.index_path)
+
+    def refresh(self): # Remap the joke file and update the index if its size changed
+        size = os.path.getsize(self.filename)
+        if size == self.size:
+            return
+        self.close()
+        self.size = size
+        if not size:
+            return  # mmap can't map an empty file
+        with open(self.filename, 'rb') as f:
+            self.source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self.source.rfind(b'\n') + 1
+        self.update_index(self.source, end)
+        with open(self.index_path, 'rb') as f:
+            self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, self.count, _, self.build_id = INDEX_HEADER.unpack_from(self.index_map)
+        self.records = memoryview(self.index_map)[INDEX_HEADER.size:
+                                                  INDEX_HEADER.size + self.count * RECORD_SIZE].cast('Q')
+        if end < size:  # Only read the index's hashes when there is a last line to check
+            self.tail = self.scan(self.source, end, size, self.hashes(self.records))
+
+    def joke(self, i): # (setup, punchline) of joke i
+        if i < self.count:
+            start, split, length, _ = self.records[i * 4:i * 4 + 4]
+        else:
+            start, split, length, _ = self.tail[(i - self.count) * 4:(i - self.count) * 4 + 4]
+        setup = self.source[start:start + split].decode('utf-8', errors='replace')
+        punchline = self.source[start + split:start + length].decode('utf-8', errors='replace').strip()
+        return setup, punchline
+
+    def random_joke(self):
+        return self.joke(random.randrange(len(self)))
+
+    def close(self):
+        if self.records is not None:
+            self.records.release()  # The map can't close while a view is exported
+            self.index_map.close()
+            self.records = self.index_map = None
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+        self.count = 0
+        self.build_id = 0
+        self.tail = array('Q')
+        self.size = -1
+
+# Non-repeating rotation over a JokeStore: a shuffled permutation of joke numbers and a
+# cursor into it, so a draw is one step and every joke comes up once before any repeats.
+# Saved as <file>.bag; the permutation is written when it changes, the cursor on each draw
+class ShuffleBag:
+    def __init__(self, path):
+        self.path = path
+        self.build_id = 0  # Index build the joke numbers belong to
+        self.order = array('I')
+        self.cursor = 0  # Jokes drawn this pass
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, version, build_id, size, cursor = BAG_HEADER.unpack(f.read(BAG_HEADER.size))
+                order = array('I')
+                order.fromfile(f, size)
+        except (OSError, EOFError, struct.error):
+            return
+        if (magic, version) == (BAG_MAGIC, BAG_VERSION) and cursor <= size:
+            self.build_id, self.order, self.cursor = build_id, order, cursor
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(BAG_HEADER.pack(BAG_MAGIC, BAG_VERSION, self.build_id, len(self.order), self.cursor))
+            self.order.tofile(f)
+        os.replace(tmp, self.path)
+
+    def save_cursor(self): # Rewrite just the cursor at the end of the header
+        try:
+            with open(self.path, 'r+b') as f:
+                f.seek(BAG_HEADER.size - 8)
+                f.write(struct.pack('=Q', self.cursor))
+        except OSError:
+            self.save()
+
+    def sync(self, size, build_id): # Match the bag to the store's current jokes
+        if build_id != self.build_id or size < len(self.order):
+            self.build_id = build_id  # Jokes were renumbered: start a fresh pass
+            self.order = array('I', range(size))
+            random.shuffle(self.order)
+            self.cursor = 0
+            self.save()
+        elif size > len(self.order):
+            # New jokes join the part of this pass not drawn yet, at random places
+            for joke in range(len(self.order), size):
+                self.order.append(joke)
+                swap = random.randrange(self.cursor, len(self.order))
+                self.order[-1], self.order[swap] = self.order[swap], self.order[-1]
+            self.save()
+
+    def draw(self): # Next joke number
+        if self.cursor == len(self.order):
+            last = self.order[-1]
+            random.shuffle(self.order)
+            if len(self.order) > 1 and self.order[0] == last:  # No repeat across passes either
+                self.order[0], self.order[-1] = self.order[-1], self.order[0]
+            self.cursor = 0
+            self.save()
+        joke = self.order[self.cursor]
+        self.cursor += 1
+        self.save_cursor()
+        return joke
+
 def show_setup(): # Display Joke Setup
     global current_joke
-    current_joke = random.choice(jokes) # Pick a random joke from list
-    
-    if '?' in current_joke:
-        setup, _ = current_joke.split('?', 1)
-        joke_label.config(text=setup + '?', fg="#2E86AB")
-    else:
-        joke_label.config(text=current_joke, fg="#2E86AB")
+    store.refresh() # Pick up jokes added since the last one
+    if not len(store):
+        joke_label.config(text="No jokes found!", fg="#2E86AB")
+        return
+    bag.sync(len(store), store.build_id)
+    current_joke = store.joke(bag.draw()) # Next joke in the shuffled rotation
+    joke_label.config(text=current_joke[0], fg="#2E86AB")
     
     punchline_button.config(state='normal', bg="#A23B72", fg="white")
     root.config(bg="#F8F4E3")
@@ -21,53 +229,120 @@ def show_setup(): # Display Joke Setup
     quit_button.config(bg="#C73E1D", fg="white")
 
 def show_punchline(): # Display Punchline
-    if '?' in current_joke:
-        _, punchline = current_joke.split('?', 1)
-        joke_label.config(text=joke_label.cget("text") + "\n\n" + punchline.strip(), fg="#C73E1D")
+    if current_joke[1]:
+        joke_label.config(text=joke_label.cget("text") + "\n\n" + current_joke[1], fg="#C73E1D")
     punchline_button.config(state='disabled', bg="#CCCCCC")
     root.config(bg="#FFF8E8")
 
 def quit_app(): # Exit Application
     root.destroy()
 
-# Load jokes
-jokes = load_jokes('randomJokes.txt')
-current_joke = ""
-
-# GUI setup
-root = Tk()
-root.title("Alexa Joke Teller")
-root.geometry("600x400")
-root.resizable(True, True)
-root.minsize(500, 350)
-root.config(bg="#F8F4E3")
-
-# Color scheme
-colors = {
-    "primary": "#2E86AB",      # Blue for setup
-    "secondary": "#A23B72",    # Purple for buttons
-    "accent": "#F18F01",       # Orange for tell button
-    "danger": "#C73E1D",       # Red for quit button
-    "punchline": "#C73E1D",    # Red for punchline
-    "bg_light": "#F8F4E3",     # Light beige background
-    "bg_lighter": "#FFF8E8"    # Lighter beige for punchline
-}
-
-# Configure styles
-joke_label = Label(root, text="Alexa Tell Me A Joke!", wraplength=500, font=("Arial", 16, "bold"), justify="center", bg=colors["bg_light"], fg=colors["primary"], pady=20)
-joke_label.pack(expand=True, fill="both", padx=20, pady=20)
-
-# Button frame for better layout
-button_frame = Frame(root, bg=colors["bg_light"])
-button_frame.pack(pady=20)
-
-tell_button = Button(button_frame, text="Tell me a Joke", command=show_setup, font=("Arial", 12, "bold"), bg=colors["accent"], fg="white", padx=20, pady=10, relief="raised", bd=3)
-tell_button.pack(pady=10)
-
-punchline_button = Button(button_frame, text="Show Punchline", command=show_punchline, state='disabled', font=("Arial", 12, "bold"), bg="#CCCCCC", fg="white", padx=20, pady=10, relief="raised", bd=3)
-punchline_button.pack(pady=10)
-
-quit_button = Button(button_frame, text="Quit", command=quit_app, font=("Arial", 12, "bold"), bg=colors["danger"], fg="white", padx=30, pady=10, relief="raised", bd=3)
-quit_button.pack(pady=10)
-
-root.mainloop() # Run main event on loop
\ No newline at end of file
+def benchmark_store(lines=1_000_000): # Startup, memory and draws for a large corpus, a quarter of it repeats
+    with open(JOKES_FILE, encoding='utf-8') as f:
+        sample = [line.strip() for line in f if line.strip()]
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'jokes.txt')
+    with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+        for i in range(lines):
+            j = i - 3 if i % 4 == 3 else i  # Every fourth line repeats an earlier one
+            f.write(f"{sample[j % len(sample)]} #{j}\n")
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    jokes = load_jokes(path)
+    list_time = time.perf_counter() - start
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    del jokes
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    JokeStore(path).close()
+    build_time = time.perf_counter() - start
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = JokeStore(path)
+    open_time = time.perf_counter() - start
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for _ in range(100_000):
+        store.random_joke()
+    pick_time = (time.perf_counter() - start) / 100_000
+    
+    start = time.perf_counter()
+    bag = ShuffleBag(path + '.bag')
+    bag.sync(len(store), store.build_id)
+    bag_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10_000):
+        store.joke(bag.draw())
+    draw_time = (time.perf_counter() - start) / 10_000
+    
+    with open(path, 'a', encoding='utf-8', newline='\r\n') as f:
+        for i in range(1000):
+            f.write(f"{sample[i % len(sample)]} #new{i}\n")
+    start = time.perf_counter()
+    store.refresh()
+    grow_time = time.perf_counter() - start
+    total = len(store)
+    store.close()
+    os.remove(path)
+    os.remove(path + '.idx')
+    os.remove(path + '.bag')
+    os.rmdir(folder)
+    
+    print(f"{lines:,} jokes, list load: {list_time:.2f}s, {list_bytes / 2**20:.0f} MiB")
+    print(f"index build: {build_time:.2f}s, reopen: {open_time * 1000:.2f} ms, {store_bytes / 1024:.0f} KiB")
+    print(f"random joke: {pick_time * 1e6:.1f} us, +1,000 lines reindexed in {grow_time * 1000:.1f} ms "
+          f"({total:,} unique jokes)")
+    print(f"shuffle bag: {bag_time:.2f}s to shuffle, {draw_time * 1e6:.1f} us per saved draw")
+
+if __name__ == "__main__":
+    if "--bench-store" in sys.argv:
+        benchmark_store()
+        sys.exit()
+    
+    # Load jokes
+    store = JokeStore(JOKES_FILE)
+    bag = ShuffleBag(JOKES_FILE + '.bag')
+    current_joke = ("", "")
+    
+    # GUI setup
+    root = Tk()
+    root.title("Alexa Joke Teller")
+    root.geometry("600x400")
+    root.resizable(True, True)
+    root.minsize(500, 350)
+    root.config(bg="#F8F4E3")
+
+    # Color scheme
+    colors = {
+        "primary": "#2E86AB",      # Blue for setup
+        "secondary": "#A23B72",    # Purple for buttons
+        "accent": "#F18F01",       # Orange for tell button
+        "danger": "#C73E1D",       # Red for quit button
+        "punchline": "#C73E1D",    # Red for punchline
+        "bg_light": "#F8F4E3",     # Light beige background
+        "bg_lighter": "#FFF8E8"    # Lighter beige for punchline
+    }
+
+    # Configure styles
+    joke_label = Label(root, text="Alexa Tell Me A Joke!", wraplength=500, font=("Arial", 16, "bold"), justify="center", bg=colors["bg_light"], fg=colors["primary"], pady=20)
+    joke_label.pack(expand=True, fill="both", padx=20, pady=20)
+
+    # Button frame for better layout
+    button_frame = Frame(root, bg=colors["bg_light"])
+    button_frame.pack(pady=20)
+
+    tell_button = Button(button_frame, text="Tell me a Joke", command=show_setup, font=("Arial", 12, "bold"), bg=colors["accent"], fg="white", padx=20, pady=10, relief="raised", bd=3)
+    tell_button.pack(pady=10)
+
+    punchline_button = Button(button_frame, text="Show Punchline", command=show_punchline, state='disabled', font=("Arial", 12, "bold"), bg="#CCCCCC", fg="white", padx=20, pady=10, relief="raised", bd=3)
+    punchline_button.pack(pady=10)
+
+    quit_button = Button(button_frame, text="Quit", command=quit_app, font=("Arial", 12, "bold"), bg=colors["danger"], fg="white", padx=30, pady=10, relief="raised", bd=3)
+    quit_button.pack(pady=10)
+
+    root.mainloop() # Run main event on loop
\ No newline at end of file
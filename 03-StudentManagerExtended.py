@@ -1,67 +1,951 @@
 from tkinter import *
 from tkinter import messagebox, simpledialog, ttk
+import argparse
+import bisect
+import glob
+import heapq
+import locale
+import mmap
+import os
+import queue
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain, islice
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for headless bulk grading
+    np = None
 
 FILENAME = "studentMarks.txt"
+JOURNAL = FILENAME + ".journal"
+COMPACT_MIN = 1000  # Journal entries always allowed before compacting
+BINARY_SUFFIX = ".smb"  # Rosters with this suffix use the binary column format
+SAVE_DELAY_MS = 300  # Edits made within this window are journalled as one batch
+GRADES = [('A',70),('B',60),('C',50),('D',40),('F',0)]  # Lowest percentage for each grade
+MARK_MIN, MARK_MAX = 0, 2**31 - 1  # Negative marks can't be graded; the top must fit the int32 binary format
+TEXT_ENCODING = locale.getpreferredencoding(False)  # What save_data writes text rosters in
+
+# Sorted keys held in blocks of a few hundred, with the largest key of each block
+# kept alongside; finding a slot is two bisects and an insert or delete only
+# shifts one small block rather than the whole list
+class RankIndex:
+    BLOCK = 512
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        self.blocks = [keys[i:i + self.BLOCK] for i in range(0, len(keys), self.BLOCK)]
+        self.maxes = [b[-1] for b in self.blocks]
+        self.size = len(keys)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(b) for b in reversed(self.blocks))
+
+    def add(self, key):
+        self.size += 1
+        if not self.blocks:
+            self.blocks, self.maxes = [[key]], [key]
+            return
+        i = min(bisect.bisect_left(self.maxes, key), len(self.blocks) - 1)
+        block = self.blocks[i]
+        bisect.insort(block, key)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * self.BLOCK:  # Split oversized blocks in half
+            self.blocks[i:i + 1] = [block[:self.BLOCK], block[self.BLOCK:]]
+            self.maxes[i:i + 1] = [block[self.BLOCK - 1], block[-1]]
+
+    def remove(self, key):
+        i = bisect.bisect_left(self.maxes, key)
+        block = self.blocks[i]
+        del block[bisect.bisect_left(block, key)]
+        self.size -= 1
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i], self.maxes[i]
+
+    def first(self):
+        return self.blocks[0][0] if self.blocks else None
+
+    def last(self):
+        return self.blocks[-1][-1] if self.blocks else None
+
+# In-memory student store with hash indexes on code and (case-insensitive) name,
+# plus a (percentage, code) rank index for ordered views and extremes
+class StudentStore:
+    def __init__(self, records=()):
+        self.by_code = {}  # code -> record, kept in display order
+        self.by_name = {}  # lower-case name -> list of records sharing that name
+        self.stats = {}  # code -> cached calc_stats() result, refreshed only when marks change
+        self.pct_total = 0  # Sum of percentages in hundredths, so the average never drifts
+        self.ranked = RankIndex()  # (pct, code) for every student, lowest first
+        self.extend(records)
+
+    def __len__(self):
+        return len(self.by_code)
+
+    def __iter__(self):
+        return iter(self.by_code.values())
+
+    def add(self, s):
+        if s['code'] in self.by_code:
+            raise ValueError(f"Duplicate student code: {s['code']}")
+        st = calc_stats(s)  # Raises before any index changes if the marks can't be graded
+        self.by_code[s['code']] = s
+        self.by_name.setdefault(s['name'].lower(), []).append(s)
+        self.ranked.add(self._cache_stats(s, st))
+
+    def extend(self, records):
+        # Bulk add for loading: codes already present are skipped (first record wins),
+        # and a big batch rebuilds the rank index once instead of inserting key by key
+        # A record that can't be graded raises ValueError; those before it stay added
+        added = []
+        try:
+            for s in records:
+                if s['code'] not in self.by_code:
+                    st = calc_stats(s)
+                    self.by_code[s['code']] = s
+                    self.by_name.setdefault(s['name'].lower(), []).append(s)
+                    added.append(self._cache_stats(s, st))
+        finally:
+            if len(added) > len(self.ranked):
+                self.ranked = RankIndex(chain(self.ranked, added))
+            else:
+                for key in added:
+                    self.ranked.add(key)
+
+    def remove(self, s):
+        del self.by_code[s['code']]
+        self._unindex_name(s)
+        self._drop_stats(s)
+
+    def update(self, s, name=None, marks=None):
+        # New marks are graded first, so a ValueError leaves the record untouched
+        if marks is not None:
+            st = calc_stats({'marks': marks})
+        # Keep the name index in sync when a record is renamed
+        if name is not None and name != s['name']:
+            self._unindex_name(s)
+            s['name'] = name
+            self.by_name.setdefault(name.lower(), []).append(s)
+        if marks is not None:
+            self._drop_stats(s)
+            s['marks'] = marks
+            self.ranked.add(self._cache_stats(s, st))
+
+    def find(self, ident):
+        # Look up by code first, then by name; returns None when nothing matches
+        if not ident:
+            return None
+        ident = ident.strip()
+        if ident in self.by_code:
+            return self.by_code[ident]
+        matches = self.by_name.get(ident.lower())
+        return matches[0] if matches else None
+
+    def stats_of(self, s):
+        return self.stats[s['code']]
+
+    def average(self):
+        return round(self.pct_total / 100 / len(self), 2) if self.by_code else 0
+
+    def highest(self):
+        key = self.ranked.last()
+        return self.by_code[key[1]] if key else None
+
+    def lowest(self):
+        key = self.ranked.first()
+        return self.by_code[key[1]] if key else None
+
+    def top(self, k):
+        return [self.by_code[code] for _, code in islice(reversed(self.ranked), k)]
+
+    def bottom(self, k):
+        return [self.by_code[code] for _, code in islice(self.ranked, k)]
+
+    def sort_by_pct(self, reverse=False):
+        # Display order comes straight from the rank index, no comparisons needed
+        ranked = reversed(self.ranked) if reverse else iter(self.ranked)
+        self.by_code = {code: self.by_code[code] for _, code in ranked}
+
+    def _cache_stats(self, s, st):
+        # Cache the record's calc_stats() result and return its rank key
+        self.stats[s['code']] = st
+        self.pct_total += round(st[2] * 100)
+        return st[2], s['code']
+
+    def _drop_stats(self, s):
+        st = self.stats.pop(s['code'])
+        self.pct_total -= round(st[2] * 100)
+        self.ranked.remove((st[2], s['code']))
+
+    def _unindex_name(self, s):
+        same = self.by_name[s['name'].lower()]
+        same.remove(s)
+        if not same:
+            del self.by_name[s['name'].lower()]
+
+# Yield (line number, text) pairs; the mmap path reads straight from the page cache
+def iter_lines(filename=FILENAME, use_mmap=False, on_error=None):
+    with open(filename, 'rb') as f:
+        if not use_mmap:
+            yield from _decode_lines(f, on_error)
+            return
+        if os.fstat(f.fileno()).st_size == 0:  # Empty files cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _decode_lines(iter(mm.readline, b''), on_error)
+
+# Lines are decoded one at a time so an undecodable line is reported to
+# on_error(line_no, line, error) and skipped rather than ending the read
+def _decode_lines(raw_lines, on_error):
+    for line_no, raw in enumerate(raw_lines, 1):
+        try:
+            yield line_no, raw.decode(TEXT_ENCODING)
+        except UnicodeDecodeError as e:
+            if on_error: on_error(line_no, raw.decode(TEXT_ENCODING, errors='replace'), e)
 
-# Load data from file
-def load_data():
-    students = []
+# Parse one "code,name,mark,..." line; None for blank lines, ValueError if malformed
+def parse_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    parts = line.split(',')
+    if len(parts) < 3:
+        raise ValueError("expected code,name,marks...")
+    return {'code': parts[0], 'name': parts[1], 'marks': parse_marks(parts[2:])}
+
+# Marks from their text fields; ValueError unless each is a whole number in range
+def parse_marks(fields):
+    marks = list(map(int, fields))
+    if not all(MARK_MIN <= m <= MARK_MAX for m in marks):
+        raise ValueError("mark out of range")
+    return marks
+
+# Stream records in lists of up to chunk_size; bad lines are skipped and passed
+# to on_error(line_no, line, error) instead of aborting the whole load
+def iter_chunks(filename=FILENAME, chunk_size=10_000, on_error=None, use_mmap=False):
+    chunk = []
+    for line_no, line in iter_lines(filename, use_mmap, on_error):
+        try:
+            s = parse_line(line)
+        except ValueError as e:
+            if on_error: on_error(line_no, line, e)
+            continue
+        if s:
+            chunk.append(s)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+# Load data from file, then replay any journalled edits on top of it;
+# bad lines are appended to errors as (line number, message), and bad journal
+# lines to journal_errors the same way (or to errors when that isn't given)
+# progress(count) is called as records come in
+def load_data(errors=None, use_mmap=False, journal=None, filename=None, progress=None, journal_errors=None):
+    filename = filename or FILENAME
+    students = StudentStore()
+    on_error = (lambda n, line, e: errors.append((n, str(e)))) if errors is not None else None
+    if journal_errors is not None:
+        on_journal_error = lambda n, line, e: journal_errors.append((n, str(e)))
+    else:
+        on_journal_error = on_error
     try:
-        with open(FILENAME, 'r') as f:
-            for line in f:
-                parts = line.strip().split(',')
-                if len(parts) >= 3:
-                    code, name = parts[0], parts[1]
-                    marks = list(map(int, parts[2:]))
-                    students.append({'code': code, 'name': name, 'marks': marks})
+        if filename.endswith(BINARY_SUFFIX):
+            with BinaryRoster(filename) as roster:
+                students.extend(roster.records())
+        else:
+            for chunk in iter_chunks(filename, on_error=on_error, use_mmap=use_mmap):
+                students.extend(chunk)  # First record for a code wins
+                if progress: progress(len(students))
     except FileNotFoundError:  # File doesn't exist yet
         pass
+    if journal:
+        journal.replay(students, on_journal_error)
     return students
 
-# Save student data to file
-def save_data(students):
-    with open(FILENAME, 'w') as f:
-        for s in students:
-            line = f"{s['code']},{s['name']}," + ",".join(map(str, s['marks']))
-            f.write(line + "\n")
+# Save student data to file; written to a temp file and renamed so a crash
+# never leaves a half-written FILENAME behind
+def save_data(students, filename=None):
+    filename = filename or FILENAME
+    tmp = filename + ".tmp"
+    binary = filename.endswith(BINARY_SUFFIX)
+    f = open(tmp, 'wb' if binary else 'w')  # Outside the try: if this fails there is nothing to remove
+    try:
+        with f:
+            if binary:
+                write_binary(students, f)
+            else:
+                for s in students:
+                    line = f"{s['code']},{s['name']}," + ",".join(map(str, s['marks']))
+                    f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:  # Don't leave a half-written temp file behind
+        os.remove(tmp)
+        raise
+    os.replace(tmp, filename)
+
+# Binary roster layout (little-endian, every section 4-byte aligned):
+#   header   magic, version, marks columns (w), record count (n), string table size
+#   widths   n x uint8, marks used by each row
+#   marks    n*w x int32, zero-padded rows
+#   offsets  2n+1 x uint32, code i is strings[off[2i]:off[2i+1]], name i follows it
+#   strings  UTF-8 code and name text
+BINARY_HEADER = struct.Struct('<4sHHII')
+BINARY_MAGIC = b'SMB1'
+
+def _pad4(n):
+    return (n + 3) & ~3
+
+# Write records in the binary roster layout to an open binary file
+def write_binary(records, f):
+    records = list(records)
+    width = max((len(s['marks']) for s in records), default=0)
+    if width > 255:
+        raise ValueError("binary format holds at most 255 marks per student")
+    widths = bytes(len(s['marks']) for s in records)
+    marks, offsets, strings = array('i'), array('I', [0]), bytearray()
+    for s in records:
+        marks.extend(s['marks'])
+        marks.extend([0] * (width - len(s['marks'])))
+        for text in (s['code'], s['name']):
+            strings += text.encode('utf-8')
+            offsets.append(len(strings))
+    if sys.byteorder == 'big':
+        marks.byteswap()
+        offsets.byteswap()
+    f.write(BINARY_HEADER.pack(BINARY_MAGIC, 1, width, len(records), len(strings)))
+    f.write(widths + bytes(_pad4(len(widths)) - len(widths)))
+    f.write(marks.tobytes())
+    f.write(offsets.tobytes())
+    f.write(bytes(strings))
+
+# Read-only view of a binary roster. The file is mmapped and every column is a
+# memoryview into it, so opening costs the same for 10 or 10 million students
+class BinaryRoster:
+    def __init__(self, filename):
+        self._file = open(filename, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < BINARY_HEADER.size:  # Also can't mmap an empty file
+            self._file.close()
+            raise ValueError(f"{filename} is not a binary student roster")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        magic, version, self.width, self.count, strings_len = BINARY_HEADER.unpack_from(view)
+        # The header's sizes must fit the file, or a truncated roster would slice short columns
+        needed = (BINARY_HEADER.size + _pad4(self.count) + 4 * self.count * self.width
+                  + 4 * (2 * self.count + 1) + strings_len)
+        if magic != BINARY_MAGIC or version != 1 or size < needed:
+            view.release()
+            self.close()
+            raise ValueError(f"{filename} is not a binary student roster")
+        pos = BINARY_HEADER.size
+        self.widths = view[pos:pos + self.count]
+        pos += _pad4(self.count)
+        self.marks = self._column(view[pos:pos + 4 * self.count * self.width], 'i')
+        pos += 4 * self.count * self.width
+        self.offsets = self._column(view[pos:pos + 4 * (2 * self.count + 1)], 'I')
+        pos += 4 * (2 * self.count + 1)
+        self.strings = view[pos:pos + strings_len]
+        self._views = [view, self.widths, self.marks, self.offsets, self.strings]
+
+    def _column(self, view, typecode):
+        if sys.byteorder == 'little':
+            return view.cast(typecode)
+        column = array(typecode, view)  # Big-endian hosts need a swapped copy
+        column.byteswap()
+        return memoryview(column)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def code(self, i):
+        return str(self.strings[self.offsets[2 * i]:self.offsets[2 * i + 1]], 'utf-8')
+
+    def name(self, i):
+        return str(self.strings[self.offsets[2 * i + 1]:self.offsets[2 * i + 2]], 'utf-8')
+
+    def marks_of(self, i):
+        start = i * self.width
+        return self.marks[start:start + self.widths[i]]  # Still a view, no copy
+
+    def records(self):
+        for i in range(self.count):
+            yield {'code': self.code(i), 'name': self.name(i), 'marks': self.marks_of(i).tolist()}
+
+    def close(self):
+        # Views must be released before the mmap can close
+        for v in getattr(self, '_views', []):
+            v.release()
+        self._mm.close()
+        self._file.close()
+
+# Convert a text marks file to the binary format, and back
+def text_to_binary(src, dest, on_error=None):
+    records = [s for chunk in iter_chunks(src, on_error=on_error) for s in chunk]
+    save_data(records, dest)
+    return len(records)
+
+def binary_to_text(src, dest):
+    with BinaryRoster(src) as roster:
+        with open(dest, 'w') as f:
+            for s in roster.records():
+                f.write(f"{s['code']},{s['name']}," + ",".join(map(str, s['marks'])) + "\n")
+        return len(roster)
+
+# Append-only log of add/update/delete edits. Each edit costs one appended line;
+# fsyncs are batched, and compact() folds the log back into FILENAME
+class Journal:
+    def __init__(self, path=JOURNAL, sync_every=20, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every  # fsync after this many unsynced entries...
+        self.sync_interval = sync_interval  # ...or once this many seconds have passed
+        self.entries = 0  # Entries since the last compaction was requested (Tk thread)
+        self.pending = 0  # Entries written but not yet fsynced (I/O thread)
+        self.last_sync = time.monotonic()
+        self.f = None
+
+    def replay(self, students, on_error=None):
+        # Entries are upserts/deletes, so replaying over an already compacted file is harmless
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            good_end = 0
+            for line_no, raw in enumerate(f, 1):
+                if not raw.endswith(b"\n"):
+                    break  # Torn final write from a crash; dropped below
+                good_end += len(raw)
+                try:
+                    line = raw.decode('utf-8')
+                    op, _, rest = line.partition(',')
+                    if op == 'delete':
+                        s = students.by_code.get(rest.strip())
+                        if s: students.remove(s)
+                    elif op in ('add', 'update'):
+                        rec = parse_line(rest)
+                        if rec is None:
+                            raise ValueError("empty record")
+                        s = students.by_code.get(rec['code'])
+                        if s: students.update(s, name=rec['name'], marks=rec['marks'])
+                        else: students.add(rec)
+                    else:
+                        raise ValueError(f"unknown journal entry {op!r}")
+                except ValueError as e:  # Includes UnicodeDecodeError
+                    if on_error:
+                        on_error(line_no, raw.decode('utf-8', errors='replace'), ValueError(f"journal: {e}"))
+                self.entries += 1
+        if good_end < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_end)
+
+    def open(self):
+        self.f = open(self.path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def entry(op, s):
+        # Formatted up front, so the line is a snapshot even if s changes before it is written
+        line = f"{op},{s['code']}"
+        if op != 'delete':
+            line += f",{s['name']}," + ",".join(map(str, s['marks']))
+        return line
+
+    def append(self, lines):
+        self.f.write("".join(line + "\n" for line in lines))
+        self.f.flush()
+        self.pending += len(lines)
+        if self.pending >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.pending:
+            os.fsync(self.f.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def compact(self, students):
+        # FILENAME is replaced atomically before the journal is emptied, so a crash
+        # in between only means the same edits get replayed once more
+        save_data(students)
+        self.f.truncate(0)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self.f:
+            self.sync()
+            self.f.close()
+            self.f = None
+
+# File I/O runs on a single worker thread, so writes stay in submission order;
+# results come back to Tk through ui_queue, which the Tk thread drains with after()
+io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-io")
+ui_queue = queue.Queue()
+pending_lines = []  # Journal entries waiting for the next batched write
+flush_job = None  # after() id of the scheduled batch write
+busy = 0  # Background tasks currently shown in the status bar
+loaded = False  # Set once the roster has loaded; until then students is only a placeholder
+
+# Call fn(*args) on the Tk thread; safe to use from the worker
+def post(fn, *args):
+    ui_queue.put((fn, args))
+
+def poll_ui_queue():
+    while True:
+        try:
+            fn, args = ui_queue.get_nowait()
+        except queue.Empty:
+            break
+        fn(*args)
+    root.after(50, poll_ui_queue)
+
+# Show or hide the status bar progress indicator
+def set_busy(on):
+    global busy
+    busy += 1 if on else -1
+    if busy:
+        progress.start(15)
+    else:
+        progress.stop()
+        update_status()
+
+# Run fn(*args) on the I/O thread and hand its result to on_done on the Tk thread
+def run_in_background(fn, *args, on_done=None, show_busy=False):
+    if show_busy:
+        set_busy(True)
+    def task():
+        try:
+            result = fn(*args)
+        except Exception as e:
+            post(messagebox.showerror, "Error", f"{fn.__name__} failed: {e}")
+        else:
+            if on_done: post(on_done, result)
+        finally:
+            if show_busy: post(set_busy, False)
+    return io_pool.submit(task)
+
+# Journal one edit; edits arriving within SAVE_DELAY_MS are written as one batch, and the
+# journal is compacted once it outgrows the roster so writes stay O(1) amortised
+def log_edit(op, s):
+    global flush_job
+    pending_lines.append(Journal.entry(op, s))
+    journal.entries += 1
+    if journal.entries > max(COMPACT_MIN, len(students)):
+        compact_in_background()
+    elif flush_job is None:
+        flush_job = root.after(SAVE_DELAY_MS, flush_edits)
+
+def flush_edits():
+    global flush_job
+    if flush_job is not None:
+        root.after_cancel(flush_job)
+        flush_job = None
+    if pending_lines:
+        run_in_background(journal.append, pending_lines[:])
+        pending_lines.clear()
+
+def compact_in_background():
+    flush_edits()
+    journal.entries = 0
+    # Shallow copies are enough: edits replace a record's name and marks rather than mutating them
+    run_in_background(journal.compact, [dict(s) for s in students], show_busy=True)
+
+# Flush batched journal writes to disk about once a second
+def sync_journal():
+    io_pool.submit(journal.sync)
+    root.after(1000, sync_journal)
+
+# Fold the journal into FILENAME before quitting, waiting for queued writes to finish.
+# If the roster never loaded (still loading, or failed) the file is left untouched
+def on_close():
+    if loaded:
+        status.set("Saving...")
+        root.update_idletasks()
+        flush_edits()
+        io_pool.submit(journal.compact, [dict(s) for s in students])
+    io_pool.submit(journal.close)
+    io_pool.shutdown(wait=loaded)
+    root.destroy()
+
+# Worker side of startup: read the roster and replay the journal off the Tk thread
+def load_in_background():
+    errors, journal_errors = [], []
+    store = load_data(errors, journal=journal, journal_errors=journal_errors,
+                      progress=lambda n: post(status.set, f"Loading... {n} students"))
+    journal.open()
+    return store, [(FILENAME, errors), (journal.path, journal_errors)]
+
+def on_loaded(result):
+    global students, loaded
+    students, skipped = result
+    loaded = True
+    refresh_table()
+    for btn in action_buttons:
+        btn.config(state='normal')
+    # One sentence per file that had bad lines, so each line number points at the right file
+    report = []
+    for path, errors in skipped:
+        if errors:
+            lines = ", ".join(str(n) for n, _ in errors[:10])
+            report.append(f"{len(errors)} malformed line(s) in {path} were skipped "
+                          f"(lines {lines}{', ...' if len(errors) > 10 else ''}).")
+    if report:
+        messagebox.showwarning("Skipped Lines", "\n".join(report))
 
 # Calculate coursework, exam, percentage, grade
+# Raises ValueError for marks that can't be graded (none at all, or a negative total)
 def calc_stats(s):
+    if not s['marks']:
+        raise ValueError("no marks")
     cw, exam = sum(s['marks'][:-1]), s['marks'][-1]  # Sum of coursework, last mark = exam
     pct = round((cw + exam) / 160 * 100, 2)          # Convert to percentage
     # Determine grade based on percentage
-    grade = next(g for g, r in [('A',70),('B',60),('C',50),('D',40),('F',0)] if pct >= r)
+    grade = next((g for g, r in GRADES if pct >= r), None)
+    if grade is None:
+        raise ValueError(f"marks total {cw + exam} is below every grade")
+    return cw, exam, pct, grade
+
+# Turn parallel code/name/"marks text" lists into columns: codes, names,
+# zero-padded marks matrix and marks per row
+def to_columns(codes, names, rests):
+    widths = np.fromiter((r.count(',') + 1 for r in rests), dtype=np.int64, count=len(rests))
+    # Parse every mark in one pass, then scatter them into a zero-padded matrix
+    flat = np.array(",".join(rests).split(','), dtype=np.int64) if rests else np.zeros(0, np.int64)
+    if len(flat) != widths.sum():
+        raise ValueError("marks do not match their rows")
+    if len(flat) and (flat.min() < MARK_MIN or flat.max() > MARK_MAX):
+        raise ValueError("mark out of range")
+    rows = np.repeat(np.arange(len(rests)), widths)
+    cols = np.arange(len(flat)) - np.repeat(np.cumsum(widths) - widths, widths)
+    marks = np.zeros((len(rests), int(widths.max()) if rests else 0), dtype=np.int64)
+    marks[rows, cols] = flat
+    return np.array(codes, dtype=object), np.array(names, dtype=object), marks, widths
+
+# Stream a marks file as column chunks of up to chunk_size rows, reporting bad lines
+# to on_error like iter_chunks; clean chunks are parsed without per-line int() calls
+def iter_columns(filename=FILENAME, chunk_size=100_000, on_error=None, use_mmap=False):
+    batch = []
+    for item in iter_lines(filename, use_mmap, on_error):
+        if item[1].strip():
+            batch.append(item)
+        if len(batch) >= chunk_size:
+            yield _batch_columns(batch, on_error)
+            batch = []
+    if batch:
+        yield _batch_columns(batch, on_error)
+
+def _batch_columns(batch, on_error):
+    parts = [line.strip().split(',', 2) for _, line in batch]
+    try:
+        if any(len(p) < 3 for p in parts):
+            raise ValueError
+        return to_columns(*zip(*parts))
+    except (ValueError, OverflowError):  # OverflowError: a mark too big for int64
+        pass
+    # Slow path: find the bad lines, report them, then parse the rest in bulk
+    good = []
+    for (line_no, line), p in zip(batch, parts):
+        try:
+            parse_line(line)
+            good.append(p)
+        except ValueError as e:
+            if on_error: on_error(line_no, line, e)
+    return to_columns(*zip(*good)) if good else to_columns([], [], [])
+
+# Vectorised calc_stats over whole columns; returns cw, exam, pct and grade arrays
+def calc_stats_columns(marks, widths):
+    exam = marks[np.arange(len(marks)), widths - 1]
+    cw = marks.sum(axis=1) - exam  # Padding is zero, so it adds nothing to coursework
+    # Percentages depend only on the total, so round each distinct total once in Python
+    # to get results identical to calc_stats
+    totals, inverse = np.unique(cw + exam, return_inverse=True)
+    pct = np.array([round(int(t) / 160 * 100, 2) for t in totals], dtype=np.float64)[inverse]
+    bounds = np.array([r for _, r in reversed(GRADES[:-1])], dtype=np.float64)
+    letters = np.array([g for g, _ in reversed(GRADES)], dtype=object)
+    grade = letters[np.searchsorted(bounds, pct, side='right')]
     return cw, exam, pct, grade
 
+# Headless bulk grading: code,name,coursework,exam,percentage,grade per line.
+# Works one chunk at a time, so memory stays bounded by chunk_size
+def grade_file(src, dest, chunk_size=100_000, on_error=None, use_mmap=False):
+    count = 0
+    with open(dest, 'w') as f:
+        for codes, names, marks, widths in iter_columns(src, chunk_size, on_error, use_mmap):
+            cw, exam, pct, grade = calc_stats_columns(marks, widths)
+            _write_graded(f, codes, names, cw, exam, pct, grade)
+            count += len(codes)
+    return count
+
+def _write_graded(f, codes, names, cw, exam, pct, grade):
+    for row in zip(codes, names, cw.tolist(), exam.tolist(), pct.tolist(), grade):
+        f.write(",".join(map(str, row)) + "\n")
+
+# Streaming summary of a marks file: count, average % and grade counts,
+# plus the lowest and highest scorers as (pct, code, name)
+def summarize(filename=FILENAME, chunk_size=100_000, on_error=None, use_mmap=False):
+    count, pct_total = 0, 0
+    grades = {g: 0 for g, _ in GRADES}
+    lowest = highest = None
+    for codes, names, marks, widths in iter_columns(filename, chunk_size, on_error, use_mmap):
+        if not len(codes):
+            continue
+        cw, exam, pct, grade = calc_stats_columns(marks, widths)
+        count += len(codes)
+        pct_total += int(np.rint(pct * 100).sum())
+        for g, n in zip(*np.unique(grade, return_counts=True)):
+            grades[g] += int(n)
+        lo, hi = int(pct.argmin()), int(pct.argmax())
+        if lowest is None or pct[lo] < lowest[0]:
+            lowest = (float(pct[lo]), codes[lo], names[lo])
+        if highest is None or pct[hi] > highest[0]:
+            highest = (float(pct[hi]), codes[hi], names[hi])
+    avg = round(pct_total / 100 / count, 2) if count else 0
+    return {'count': count, 'avg': avg, 'grades': grades, 'lowest': lowest, 'highest': highest}
+
+# Map step of batch mode, run in a worker process: grade one cohort file (optionally
+# writing its graded copy to out_path) and return its partial aggregates
+def cohort_stats(path, top=10, out_path=None, chunk_size=100_000):
+    stats = {'files': 1, 'count': 0, 'pct_total': 0, 'bad_lines': 0,
+             'grades': {g: 0 for g, _ in GRADES}, 'top': []}
+    def bad_line(n, line, e):
+        stats['bad_lines'] += 1
+    out = open(out_path, 'w') if out_path else None
+    try:
+        for codes, names, marks, widths in iter_columns(path, chunk_size, bad_line):
+            if not len(codes):
+                continue
+            cw, exam, pct, grade = calc_stats_columns(marks, widths)
+            if out:
+                _write_graded(out, codes, names, cw, exam, pct, grade)
+            stats['count'] += len(codes)
+            stats['pct_total'] += int(np.rint(pct * 100).sum())
+            for g, n in zip(*np.unique(grade, return_counts=True)):
+                stats['grades'][g] += int(n)
+            best = np.argpartition(-pct, top - 1)[:top] if len(pct) > top else range(len(pct))
+            stats['top'] = heapq.nlargest(top, stats['top'] + [(float(pct[i]), codes[i], names[i], path) for i in best])
+    finally:
+        if out:
+            out.close()
+    return stats
+
+# Reduce step: fold cohort aggregates into one
+def merge_stats(parts, top=10):
+    total = {'files': 0, 'count': 0, 'pct_total': 0, 'bad_lines': 0,
+             'grades': {g: 0 for g, _ in GRADES}, 'top': []}
+    for part in parts:
+        for key in ('files', 'count', 'pct_total', 'bad_lines'):
+            total[key] += part[key]
+        for g, n in part['grades'].items():
+            total['grades'][g] += n
+        total['top'] = heapq.nlargest(top, total['top'] + part['top'])
+    total['mean'] = round(total['pct_total'] / 100 / total['count'], 2) if total['count'] else 0
+    return total
+
+# Where the graded copy of each input goes: its path relative to the inputs' common
+# folder, under out_dir, so same-named files from different folders don't collide
+def graded_paths(paths, out_dir):
+    if not paths:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    return {p: os.path.join(out_dir, os.path.relpath(os.path.abspath(p), root)) for p in paths}
+
+# Grade every marks file matched by a directory or glob across worker processes.
+# Returns the merged aggregates and a dict of per-file aggregates
+def batch_grade(pattern, workers=None, top=10, out_dir=None, chunk_size=100_000):
+    paths = sorted(glob.glob(os.path.join(pattern, '*.txt') if os.path.isdir(pattern) else pattern))
+    outputs = graded_paths(paths, out_dir) if out_dir else {}
+    # Opening an output empties it, so one that is also an input would be lost
+    inputs = {os.path.realpath(p) for p in paths}
+    clashes = sorted(out for out in outputs.values() if os.path.realpath(out) in inputs)
+    if clashes:
+        raise ValueError(f"graded copies would overwrite input files: {', '.join(clashes)}")
+    for out_path in outputs.values():
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    cohorts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(cohort_stats, path, top, outputs.get(path), chunk_size): path
+                   for path in paths}
+        for future in as_completed(futures):
+            cohorts[futures[future]] = future.result()
+    return merge_stats(cohorts.values(), top), cohorts
+
+# Windowed Treeview: only the rows in view plus a small buffer exist as Tk items,
+# and scrolling swaps which rows those are. Row iids are student codes. Arrow,
+# page and home/end keys move the selection over every row, not just those shown
+class VirtualTable:
+    def __init__(self, tree, scrollbar, row_values, buffer=10):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values  # code -> tuple of column values
+        self.buffer = buffer
+        self.codes = []  # Every row in display order
+        self.shown = []  # Codes currently materialised in the tree
+        self.offset = 0  # Index of the top visible row
+        self.current = None  # Code of the selected row, which may be scrolled out of view
+        self.page = int(tree.cget('height'))
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        scrollbar.config(command=self.yview)
+        tree.bind('<Configure>', self._on_resize)
+        tree.bind('<MouseWheel>', lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        tree.bind('<Button-4>', lambda e: self._wheel(-1))  # X11 wheel up
+        tree.bind('<Button-5>', lambda e: self._wheel(1))   # X11 wheel down
+        tree.bind('<<TreeviewSelect>>', self._on_select)
+        tree.bind('<Up>', lambda e: self._step(-1))
+        tree.bind('<Down>', lambda e: self._step(1))
+        tree.bind('<Prior>', lambda e: self._step(-self.page))
+        tree.bind('<Next>', lambda e: self._step(self.page))
+        for key in ('<Home>', '<Control-Home>'):
+            tree.bind(key, lambda e: self._select(0))
+        for key in ('<End>', '<Control-End>'):
+            tree.bind(key, lambda e: self._select(len(self.codes) - 1))
+
+    # Full rebuild, used when the order changes (initial load, sorting)
+    def set_rows(self, codes):
+        self.codes = list(codes)
+        self.offset = 0
+        self.render()
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.codes) - self.page))
+        window = self.codes[self.offset:self.offset + self.page + self.buffer]
+        if self.shown:
+            self.tree.delete(*self.shown)
+        for i, code in enumerate(window, self.offset):
+            tag = 'even' if i % 2 == 0 else 'odd'  # Alternate row colors
+            self.tree.insert('', 'end', iid=code, values=self.row_values(code), tags=(tag,))
+        self.shown = window
+        if self.current in window:
+            self.tree.selection_set(self.current)
+            self.tree.focus(self.current)
+        self._update_scrollbar()
+
+    # Incremental edits: only touch Tk when the affected row is materialised
+    def refresh_row(self, code):
+        if self.tree.exists(code):
+            self.tree.item(code, values=self.row_values(code))
+
+    def insert_row(self, code):
+        self.codes.append(code)
+        if len(self.codes) - 1 < self.offset + self.page + self.buffer:
+            self.render()
+        else:
+            self._update_scrollbar()
+
+    def delete_row(self, code):
+        index = self.codes.index(code)
+        del self.codes[index]
+        if code == self.current:
+            self.current = None
+        if index < self.offset + len(self.shown):
+            self.render()  # Rows below shift up into the window
+        else:
+            self._update_scrollbar()
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.codes))
+        elif args[0] == 'scroll':
+            step = self.page if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.render()
+
+    def _wheel(self, direction):
+        self.yview('scroll', direction * 3, 'units')
+        return "break"
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.current = selection[0]
+
+    # Move the selection by delta rows, starting from the top visible row if none
+    def _step(self, delta):
+        if self.current in self.shown:
+            index = self.offset + self.shown.index(self.current)
+        elif self.current in self.codes:  # Scrolled out of view: a full scan, but only then
+            index = self.codes.index(self.current)
+        else:
+            return self._select(self.offset)
+        return self._select(index + delta)
+
+    # Select the row at index and scroll just far enough to show it
+    def _select(self, index):
+        if self.codes:
+            index = max(0, min(index, len(self.codes) - 1))
+            self.current = self.codes[index]
+            if index < self.offset:
+                self.offset = index
+            elif index >= self.offset + self.page:
+                self.offset = index - self.page + 1
+            self.render()
+        return "break"  # Skip the Treeview's own bindings, which only know the materialised rows
+
+    def _on_resize(self, event):
+        page = max(1, event.height // self.row_height - 1)  # One row is the heading
+        if page != self.page:
+            self.page = page
+            self.render()
+
+    def _update_scrollbar(self):
+        if not self.codes:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / len(self.codes),
+                               min(1, (self.offset + self.page) / len(self.codes)))
+
+# Column values shown for one student
+def row_values(code):
+    s = students.by_code[code]
+    cw, exam, pct, grade = students.stats_of(s)
+    return (s['name'], s['code'], cw, exam, pct, grade)
+
+# Update status bar with student count and average %
+def update_status():
+    status.set(f"Students: {len(students)} | Avg %: {students.average()}")
+
 # Refresh Treeview table
 def refresh_table():
-    for row in tree.get_children():
-        tree.delete(row)
-    for i, s in enumerate(students):
-        cw, exam, pct, grade = calc_stats(s)
-        tag = 'even' if i % 2 == 0 else 'odd'  # Alternate row colors
-        tree.insert('', 'end', values=(s['name'], s['code'], cw, exam, pct, grade), tags=(tag,))
-    # Update status bar with student count and average %
-    avg = round(sum(calc_stats(s)[2] for s in students) / len(students), 2) if students else 0
-    status.set(f"Students: {len(students)} | Avg %: {avg}")
+    table.set_rows(students.by_code)
+    update_status()
 
 # View individual student
 def view_individual():
     choice = simpledialog.askstring("Select Student", "Enter name or code:")
-    for s in students:
-        if choice in (s['name'], s['code']):
-            cw, exam, pct, grade = calc_stats(s)
-            messagebox.showinfo("Student Record",
-                f"Name: {s['name']}\nCode: {s['code']}\nCoursework: {cw}\nExam: {exam}\n%: {pct}\nGrade: {grade}")
-            return
-    messagebox.showerror("Not Found", "Student not found.")
+    s = students.find(choice)
+    if s is None:
+        messagebox.showerror("Not Found", "Student not found.")
+        return
+    cw, exam, pct, grade = students.stats_of(s)
+    messagebox.showinfo("Student Record",
+        f"Name: {s['name']}\nCode: {s['code']}\nCoursework: {cw}\nExam: {exam}\n%: {pct}\nGrade: {grade}")
 
 # Show highest or lowest scorer
 def show_extreme(high=True):
     if not students: return
-    key = lambda s: calc_stats(s)[2]  # Compare based on percentage
-    s = max(students, key=key) if high else min(students, key=key)
-    cw, exam, pct, grade = calc_stats(s)
+    s = students.highest() if high else students.lowest()  # Tracked by the store
+    cw, exam, pct, grade = students.stats_of(s)
     title = "Highest" if high else "Lowest"
     messagebox.showinfo(f"{title} Scorer",
         f"Name: {s['name']}\nCode: {s['code']}\nCoursework: {cw}\nExam: {exam}\n%: {pct}\nGrade: {grade}")
@@ -70,7 +954,7 @@ def show_extreme(high=True):
 def sort_records():
     order = simpledialog.askstring("Sort", "asc or desc?")
     rev = order == 'desc'
-    students.sort(key=lambda s: calc_stats(s)[2], reverse=rev)
+    students.sort_by_pct(reverse=rev)
     refresh_table()
 
 # Add new student
@@ -78,84 +962,282 @@ def add_student():
     code = simpledialog.askstring("Add", "Student code:")
     name = simpledialog.askstring("Add", "Student name:")
     marks = simpledialog.askstring("Add", "Marks (comma-separated):")
+    if not code or not name:
+        messagebox.showerror("Error", "Code and name are required.")
+        return
     try:
-        mark_list = list(map(int, marks.split(',')))
-        students.append({'code': code, 'name': name, 'marks': mark_list})
-        save_data(students)
-        refresh_table()
+        mark_list = parse_marks(marks.split(','))
     except:
         messagebox.showerror("Error", "Invalid marks.")
+        return
+    try:
+        s = {'code': code, 'name': name, 'marks': mark_list}
+        students.add(s)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    log_edit('add', s)
+    table.insert_row(s['code'])
+    update_status()
 
 # Delete student
 def delete_student():
     ident = simpledialog.askstring("Delete", "Enter name/code:")
-    for i, s in enumerate(students):
-        if ident in (s['name'], s['code']):
-            del students[i]
-            save_data(students)
-            refresh_table()
-            return
-    messagebox.showerror("Not Found", "Student not found.")
+    s = students.find(ident)
+    if s is None:
+        messagebox.showerror("Not Found", "Student not found.")
+        return
+    students.remove(s)
+    log_edit('delete', s)
+    table.delete_row(s['code'])
+    update_status()
 
 # Update existing student
 def update_student():
     ident = simpledialog.askstring("Update", "Enter name/code:")
-    for s in students:
-        if ident in (s['name'], s['code']):
-            new_name = simpledialog.askstring("Update", "New name (blank to skip):")
-            new_marks = simpledialog.askstring("Update", "New marks (blank to skip):")
-            if new_name: s['name'] = new_name
-            if new_marks:
-                try: s['marks'] = list(map(int, new_marks.split(',')))
-                except: messagebox.showerror("Error", "Invalid marks.")
-            save_data(students)
-            refresh_table()
-            return
-    messagebox.showerror("Not Found", "Student not found.")
-
-# Main GUI 
-root = Tk()
-root.title("Student Manager")
-root.configure(bg="#f0f4fc")
-
-# Style for Treeview
-style = ttk.Style()
-style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"), background="#dbe9f4")
-style.configure("Treeview", font=("Segoe UI", 10), rowheight=25)
-style.map("Treeview", background=[('selected', '#cce5ff')])
-style.configure("TButton", font=("Segoe UI", 10), padding=5)
-
-# Status label
-status = StringVar()
-
-# Treeview table setup
-tree = ttk.Treeview(root, columns=('Name','Code','CW','Exam','%','Grade'), show='headings')
-for col in tree['columns']:
-    tree.heading(col, text=col)
-tree.tag_configure('even', background='#f9f9f9')
-tree.tag_configure('odd', background='#e0f7fa')
-tree.pack(fill='both', expand=True, padx=10, pady=10)
-
-# Buttons for actions
-btn_frame = Frame(root, bg="#f0f4fc")
-btn_frame.pack(fill='x', padx=10)
-for txt, cmd in [
-    ("View All", refresh_table),
-    ("View Individual", view_individual),
-    ("Highest Scorer", lambda: show_extreme(True)),
-    ("Lowest Scorer", lambda: show_extreme(False)),
-    ("Sort Records", sort_records),
-    ("Add Student", add_student),
-    ("Delete Student", delete_student),
-    ("Update Student", update_student),
-]:
-    Button(btn_frame, text=txt, command=cmd, bg="#d0eaff", fg="#003366", relief="raised").pack(side='left', padx=5, pady=5)
-
-# Status bar
-Label(root, textvariable=status, font=("Segoe UI", 10), bg="#f0f4fc").pack(pady=5)
-
-# Load initial data and populate table
-students = load_data()
-refresh_table()
-
-root.mainloop()
+    s = students.find(ident)
+    if s is None:
+        messagebox.showerror("Not Found", "Student not found.")
+        return
+    new_name = simpledialog.askstring("Update", "New name (blank to skip):")
+    new_marks = simpledialog.askstring("Update", "New marks (blank to skip):")
+    if new_name: students.update(s, name=new_name)
+    if new_marks:
+        try: students.update(s, marks=parse_marks(new_marks.split(',')))
+        except: messagebox.showerror("Error", "Invalid marks.")
+    log_edit('update', s)
+    table.refresh_row(s['code'])
+    update_status()
+
+# Benchmark: indexed lookups should stay flat while a linear scan grows with n
+def benchmark_lookup(sizes=(1_000, 10_000, 100_000, 200_000), lookups=2_000):
+    print(f"{'records':>10} {'store us/op':>12} {'scan us/op':>12}")
+    for n in sizes:
+        records = [{'code': str(100000 + i), 'name': f"Student {i}", 'marks': [10, 10, 10, 50]}
+                   for i in range(n)]
+        store = StudentStore(records)
+        idents = [random.choice(records)[random.choice(('code', 'name'))] for _ in range(lookups)]
+
+        start = time.perf_counter()
+        for ident in idents:
+            store.find(ident)
+        indexed = (time.perf_counter() - start) / lookups * 1e6
+
+        sample = idents[:max(1, lookups // 100)]  # Linear scans are slow, so time fewer of them
+        start = time.perf_counter()
+        for ident in sample:
+            next(s for s in records if ident in (s['name'], s['code']))
+        scan = (time.perf_counter() - start) / len(sample) * 1e6
+        print(f"{n:>10} {indexed:>12.2f} {scan:>12.2f}")
+
+# Benchmark: startup cost of the text format against the binary format
+def benchmark_startup(sizes=(10_000, 100_000, 500_000)):
+    print(f"{'records':>10} {'text parse s':>13} {'binary read s':>14} {'text load s':>12} "
+          f"{'binary load s':>14} {'binary open ms':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            text = os.path.join(tmp, f"marks{n}.txt")
+            binary = os.path.join(tmp, f"marks{n}{BINARY_SUFFIX}")
+            records = [{'code': str(100000 + i), 'name': f"Student {i}",
+                        'marks': [random.randint(0, 20) for _ in range(3)] + [random.randint(0, 100)]}
+                       for i in range(n)]
+            save_data(records, text)
+            save_data(records, binary)
+            del records
+
+            # Parsing alone, then a full load_data including building the store
+            start = time.perf_counter()
+            for _ in iter_chunks(text):
+                pass
+            text_parse = time.perf_counter() - start
+            start = time.perf_counter()
+            with BinaryRoster(binary) as roster:
+                for _ in roster.records():
+                    pass
+            binary_read = time.perf_counter() - start
+            start = time.perf_counter()
+            load_data(filename=text)
+            text_load = time.perf_counter() - start
+            start = time.perf_counter()
+            load_data(filename=binary)
+            binary_load = time.perf_counter() - start
+            start = time.perf_counter()
+            with BinaryRoster(binary) as roster:
+                roster.marks_of(n - 1)
+            binary_open = (time.perf_counter() - start) * 1000
+            print(f"{n:>10} {text_parse:>13.3f} {binary_read:>14.3f} {text_load:>12.3f} "
+                  f"{binary_load:>14.3f} {binary_open:>15.3f}")
+
+# Benchmark: refresh latency of a full Treeview rebuild against the windowed table.
+# Needs a display, since it drives a real (withdrawn) Tk window
+def benchmark_table(sizes=(1_000, 10_000, 50_000), edits=50):
+    global students
+    bench_root = Tk()
+    bench_root.withdraw()
+    bench_tree = ttk.Treeview(bench_root, columns=('Name','Code','CW','Exam','%','Grade'), show='headings')
+    bench_scroll = ttk.Scrollbar(bench_root, orient='vertical')
+    print(f"{'records':>10} {'full rebuild ms':>16} {'windowed ms':>12} {'edit ms':>9}")
+    for n in sizes:
+        students = StudentStore({'code': str(100000 + i), 'name': f"Student {i}", 'marks': [10, 10, 10, 50]}
+                                for i in range(n))
+        # The old refresh_table: delete and re-insert every row
+        start = time.perf_counter()
+        for row in bench_tree.get_children():
+            bench_tree.delete(row)
+        for i, code in enumerate(students.by_code):
+            bench_tree.insert('', 'end', values=row_values(code), tags=('even' if i % 2 == 0 else 'odd',))
+        bench_root.update_idletasks()
+        full = (time.perf_counter() - start) * 1000
+        bench_tree.delete(*bench_tree.get_children())
+
+        table = VirtualTable(bench_tree, bench_scroll, row_values)
+        start = time.perf_counter()
+        table.set_rows(students.by_code)
+        bench_root.update_idletasks()
+        windowed = (time.perf_counter() - start) * 1000
+
+        # Average of an in-view update plus an insert and delete at the end of the roster
+        start = time.perf_counter()
+        for i in range(edits):
+            s = students.by_code[table.codes[i % table.page]]
+            students.update(s, marks=[i % 20, 10, 10, 50])
+            table.refresh_row(s['code'])
+            new = {'code': f"new{i}", 'name': f"New {i}", 'marks': [1, 2, 3, 4]}
+            students.add(new)
+            table.insert_row(new['code'])
+            students.remove(new)
+            table.delete_row(new['code'])
+            bench_root.update_idletasks()
+        edit = (time.perf_counter() - start) * 1000 / (3 * edits)
+        bench_tree.delete(*bench_tree.get_children())
+        print(f"{n:>10} {full:>16.1f} {windowed:>12.1f} {edit:>9.2f}")
+    bench_root.destroy()
+
+# Main GUI
+def main():
+    global root, status, progress, tree, table, students, journal, action_buttons
+    root = Tk()
+    root.title("Student Manager")
+    root.configure(bg="#f0f4fc")
+
+    # Style for Treeview
+    style = ttk.Style()
+    style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"), background="#dbe9f4")
+    style.configure("Treeview", font=("Segoe UI", 10), rowheight=25)
+    style.map("Treeview", background=[('selected', '#cce5ff')])
+    style.configure("TButton", font=("Segoe UI", 10), padding=5)
+
+    # Status label
+    status = StringVar()
+
+    # Treeview table setup
+    table_frame = Frame(root, bg="#f0f4fc")
+    table_frame.pack(fill='both', expand=True, padx=10, pady=10)
+    scrollbar = ttk.Scrollbar(table_frame, orient='vertical')
+    scrollbar.pack(side='right', fill='y')
+    tree = ttk.Treeview(table_frame, columns=('Name','Code','CW','Exam','%','Grade'), show='headings')
+    for col in tree['columns']:
+        tree.heading(col, text=col)
+    tree.tag_configure('even', background='#f9f9f9')
+    tree.tag_configure('odd', background='#e0f7fa')
+    tree.pack(side='left', fill='both', expand=True)
+    table = VirtualTable(tree, scrollbar, row_values)
+
+    # Buttons for actions
+    btn_frame = Frame(root, bg="#f0f4fc")
+    btn_frame.pack(fill='x', padx=10)
+    action_buttons = []
+    for txt, cmd in [
+        ("View All", refresh_table),
+        ("View Individual", view_individual),
+        ("Highest Scorer", lambda: show_extreme(True)),
+        ("Lowest Scorer", lambda: show_extreme(False)),
+        ("Sort Records", sort_records),
+        ("Add Student", add_student),
+        ("Delete Student", delete_student),
+        ("Update Student", update_student),
+    ]:
+        btn = Button(btn_frame, text=txt, command=cmd, bg="#d0eaff", fg="#003366", relief="raised", state='disabled')
+        btn.pack(side='left', padx=5, pady=5)
+        action_buttons.append(btn)
+
+    # Status bar with a progress indicator for background file work
+    status_frame = Frame(root, bg="#f0f4fc")
+    status_frame.pack(pady=5)
+    Label(status_frame, textvariable=status, font=("Segoe UI", 10), bg="#f0f4fc").pack(side='left')
+    progress = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+    progress.pack(side='left', padx=10)
+
+    # Load initial data in the background; buttons are enabled once it arrives
+    students = StudentStore()
+    journal = Journal(FILENAME + ".journal")
+    refresh_table()
+    status.set("Loading...")
+    run_in_background(load_in_background, on_done=on_loaded, show_busy=True)
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    poll_ui_queue()
+    sync_journal()
+    root.mainloop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Student Manager")
+    parser.add_argument('--file', default=FILENAME, help=f"roster opened by the GUI ({BINARY_SUFFIX} for binary)")
+    parser.add_argument('--bench-lookup', action='store_true', help="benchmark indexed lookups and exit")
+    parser.add_argument('--bench-startup', action='store_true', help="benchmark text vs binary loading and exit")
+    parser.add_argument('--bench-table', action='store_true', help="benchmark table refresh latency and exit")
+    parser.add_argument('--to-binary', metavar='OUTPUT', help=f"convert --input to a binary {BINARY_SUFFIX} roster")
+    parser.add_argument('--to-text', metavar='OUTPUT', help="convert a binary --input roster back to text")
+    parser.add_argument('--grade', metavar='OUTPUT', help="grade the marks file without the GUI")
+    parser.add_argument('--summary', action='store_true', help="print a streaming summary of the marks file")
+    parser.add_argument('--input', default=FILENAME, help="marks file used by --grade and --summary")
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB', help="grade many cohort files in parallel")
+    parser.add_argument('--out', metavar='DIR', help="write graded copies of --batch files here")
+    parser.add_argument('--workers', type=int, help="worker processes for --batch (default: CPU count)")
+    parser.add_argument('--top', type=int, default=10, help="top scorers reported by --batch")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="rows parsed per chunk")
+    parser.add_argument('--mmap', action='store_true', help="read the marks file through mmap")
+    args = parser.parse_args()
+    report = lambda n, line, e: print(f"{args.input}:{n}: skipped ({e}): {line.strip()}", file=sys.stderr)
+    if args.bench_lookup:
+        benchmark_lookup()
+    elif args.bench_startup:
+        benchmark_startup()
+    elif args.bench_table:
+        benchmark_table()
+    elif args.to_binary:
+        count = text_to_binary(args.input, args.to_binary, report)
+        print(f"Wrote {count} students -> {args.to_binary}")
+    elif args.to_text:
+        count = binary_to_text(args.input, args.to_text)
+        print(f"Wrote {count} students -> {args.to_text}")
+    elif args.grade or args.summary or args.batch:
+        if np is None:
+            parser.error("--grade, --summary and --batch need NumPy (pip install numpy)")
+        start = time.perf_counter()
+        if args.batch:
+            try:
+                total, cohorts = batch_grade(args.batch, args.workers, args.top, args.out, args.chunk_size)
+            except ValueError as e:
+                parser.error(str(e))
+            elapsed = time.perf_counter() - start
+            for path, part in sorted(cohorts.items()):
+                mean = round(part['pct_total'] / 100 / part['count'], 2) if part['count'] else 0
+                print(f"{path}: {part['count']} students, mean {mean}%, {part['bad_lines']} bad lines")
+            print(f"Total: {total['count']} students in {total['files']} files, mean {total['mean']}%, "
+                  f"{total['bad_lines']} bad lines")
+            print("Grades: " + ", ".join(f"{g} {n}" for g, n in total['grades'].items()))
+            print("Top scorers:")
+            for pct, code, name, path in total['top']:
+                print(f"  {pct}% {name} ({code}) - {path}")
+            print(f"{elapsed:.2f}s, {total['count'] / elapsed:,.0f} students/s")
+        elif args.grade:
+            count = grade_file(args.input, args.grade, args.chunk_size, report, args.mmap)
+            print(f"Graded {count} students in {time.perf_counter() - start:.2f}s -> {args.grade}")
+        else:
+            summary = summarize(args.input, args.chunk_size, report, args.mmap)
+            for key, value in summary.items():
+                print(f"{key}: {value}")
+    else:
+        FILENAME = args.file
+        main()
@@ -1,11 +1,578 @@
 from tkinter import *
 from tkinter import messagebox
+from tkinter import font as tkfont
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image, ImageTk
 from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlencode
+import bisect
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import string
+import sys
+import threading
+import time
+import tracemalloc
+
+API_BASE = "https://www.themealdb.com/api/json/v1/1/"
+CACHE_FILE = "mealdb_cache.sqlite3"
+SEARCH_DEBOUNCE_MS = 300  # Quiet time after <Return> before a search is sent
+THUMB_DIR = "thumbnails"
+THUMB_SIZE = (220, 220)
+PHOTO_CACHE_SIZE = 64  # Ready-to-show PhotoImages kept in memory
+PREFETCH_WORKERS = 3  # Most prefetch requests in flight at once
+PREFETCH_AROUND = 3  # Results either side of the selection that get prefetched
+TYPEAHEAD_MIN_CHARS = 2  # Shortest query searched while typing
+TYPEAHEAD_ENTRIES = 200  # Earlier name searches kept for type-ahead
+INDEX_FILE = "meal_index.json"
+INDEX_MAX_AGE = 7 * 24 * 3600  # Crawled letters older than this are fetched again
+
+# Seconds each endpoint's responses stay fresh; 0 means never cached
+CACHE_TTLS = {
+    'categories.php': 7 * 24 * 3600,
+    'list.php': 7 * 24 * 3600,
+    'lookup.php': 24 * 3600,
+    'search.php': 3600,
+    'filter.php': 3600,
+    'random.php': 0,
+}
+UNSHARED_ENDPOINTS = {'random.php'}  # Concurrent callers each want their own answer
+API_RATE = 5  # Requests per second allowed to reach TheMealDB once a burst is used up
+API_BURST = 10
+
+# Two-tier response cache: a size-limited in-memory LRU in front of a sqlite file.
+# Entries are (stored_at, etag, last_modified, body bytes)
+class ResponseCache:
+    def __init__(self, path=CACHE_FILE, max_entries=500, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()  # Shared by the LRU and the sqlite connection
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS responses "
+                        "(key TEXT PRIMARY KEY, stored_at REAL, etag TEXT, last_modified TEXT, body BLOB)")
+        self.db.commit()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry:
+                self.memory.move_to_end(key)
+            else:
+                entry = self.db.execute("SELECT stored_at, etag, last_modified, body FROM responses WHERE key = ?",
+                                        (key,)).fetchone()
+                if entry:
+                    self._remember(key, entry)  # Promote disk hits into memory
+            if entry: self.hits += 1
+            else: self.misses += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self._remember(key, entry)
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, *entry))
+            self.db.commit()
+
+    def _remember(self, key, entry):
+        old = self.memory.pop(key, None)
+        if old:
+            self.memory_bytes -= len(old[3])
+        self.memory[key] = entry
+        self.memory_bytes += len(entry[3])
+        while self.memory and (len(self.memory) > self.max_entries or self.memory_bytes > self.max_bytes):
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted[3])
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+# Bounded on-disk cache of meal images already resized to THUMB_SIZE. Misses fetch
+# the API's small "/preview" variant (falling back to the full image) so far fewer
+# bytes are downloaded and decoded. Safe to use from worker threads
+class ThumbnailCache:
+    def __init__(self, api, directory=THUMB_DIR, max_files=2000):
+        self.api = api
+        self.directory = directory
+        self.max_files = max_files
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, image_url):
+        return os.path.join(self.directory, hashlib.sha1(image_url.encode()).hexdigest() + ".jpg")
+
+    # Return a decoded, resized PIL image for image_url. With download=False a file
+    # missing from the cache raises OSError instead of going to the network
+    def load(self, image_url, download=True):
+        path = self.path_for(image_url)
+        try:
+            img = Image.open(path)
+            img.load()  # Decode here, on the calling (worker) thread
+            os.utime(path)  # Mark as recently used for eviction
+            return img
+        except (OSError, ValueError):
+            if not download:
+                raise
+        try:
+            data = self.api.get_bytes(image_url + "/preview")
+        except requests.RequestException:
+            data = self.api.get_bytes(image_url)
+        img = Image.open(BytesIO(data)).convert("RGB").resize(THUMB_SIZE)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        img.save(tmp, "JPEG", quality=90)
+        os.replace(tmp, path)
+        self.evict()
+        return img
+
+    # Drop the least recently used files once the cache holds more than max_files
+    def evict(self):
+        with self.lock:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".jpg")]
+            if len(names) <= self.max_files:
+                return
+            paths = sorted((os.path.join(self.directory, n) for n in names), key=os.path.getmtime)
+            for path in paths[:len(paths) - self.max_files]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+# One meal, parsed once from TheMealDB's flat record with its 20 strIngredientN and
+# strMeasureN keys. Ingredients are (ingredient, measure) pairs; categories, areas and
+# ingredient names repeat across meals, so one interned copy of each is shared
+class Meal:
+    __slots__ = ('id', 'name', 'category', 'area', 'tags', 'thumb', 'instructions',
+                 'source', 'ingredients')
+
+    def __init__(self, id, name, category=None, area=None, tags=None, thumb=None,
+                 instructions=None, source=None, ingredients=()):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.area = area
+        self.tags = tags
+        self.thumb = thumb
+        self.instructions = instructions  # None for the short records filter.php returns
+        self.source = source
+        self.ingredients = ingredients
+
+    @classmethod
+    def from_api(cls, data):
+        ingredients = []
+        for i in range(1, 21):
+            ingredient = (data.get(f'strIngredient{i}') or '').strip()
+            if ingredient:
+                ingredients.append((sys.intern(ingredient), (data.get(f'strMeasure{i}') or '').strip()))
+        category, area = data.get('strCategory'), data.get('strArea')
+        return cls(data['idMeal'], data['strMeal'],
+                   sys.intern(category) if category else None,
+                   sys.intern(area) if area else None,
+                   data.get('strTags') or None, data.get('strMealThumb') or None,
+                   data.get('strInstructions'), data.get('strSource') or None,
+                   tuple(ingredients))
+
+    # Back to TheMealDB's record shape, for saving
+    def to_api(self):
+        data = {'idMeal': self.id, 'strMeal': self.name, 'strCategory': self.category,
+                'strArea': self.area, 'strTags': self.tags, 'strMealThumb': self.thumb,
+                'strInstructions': self.instructions, 'strSource': self.source}
+        for i, (ingredient, measure) in enumerate(self.ingredients, 1):
+            data[f'strIngredient{i}'] = ingredient
+            data[f'strMeasure{i}'] = measure
+        return data
+
+# Meals from an API response, or [] when it has none
+def parse_meals(data):
+    return [Meal.from_api(m) for m in data.get('meals') or []]
+
+# Trie of earlier name searches. TheMealDB's name search is a case-insensitive
+# substring match, so the results for "chick" already hold every result for
+# "chicken" and can be filtered locally instead of asking the API again
+class QueryTrie:
+    def __init__(self, max_entries=TYPEAHEAD_ENTRIES):
+        self.root = {}  # char -> child node; the None key holds a query's results
+        self.entries = OrderedDict()  # query -> its node, least recently stored first
+        self.max_entries = max_entries
+
+    def insert(self, query, meals):
+        node = self.root
+        for ch in query:
+            node = node.setdefault(ch, {})
+        node[None] = meals
+        self.entries[query] = node
+        self.entries.move_to_end(query)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)[1].pop(None, None)
+
+    # Longest stored prefix of query and its results, or (None, None)
+    def longest_prefix(self, query):
+        node, found = self.root, (None, None)
+        for i, ch in enumerate(query):
+            node = node.get(ch)
+            if node is None:
+                break
+            if None in node:
+                found = (query[:i + 1], node[None])
+        return found
+
+# Listbox that only holds the rows currently on screen; the scrollbar, mouse wheel
+# and arrow/page/home/end keys move a window over the full item list instead of Tk
+# scrolling its own rows. The selection is kept as an index into the full list
+class VirtualList:
+    def __init__(self, listbox, scrollbar):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.items = []  # Every item in display order
+        self.offset = 0  # Index of the top visible row
+        self.current = None  # Index of the selected item, which may be scrolled out of view
+        self.page = int(listbox.cget('height'))
+        self.row_height = tkfont.Font(font=listbox.cget('font')).metrics('linespace') + 1
+        scrollbar.config(command=self.yview)
+        listbox.bind('<Configure>', self._on_resize)
+        listbox.bind('<MouseWheel>', lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        listbox.bind('<Button-4>', lambda e: self._wheel(-1))  # X11 wheel up
+        listbox.bind('<Button-5>', lambda e: self._wheel(1))   # X11 wheel down
+        listbox.bind('<<ListboxSelect>>', self._on_select)
+        listbox.bind('<Up>', lambda e: self._step(-1))
+        listbox.bind('<Down>', lambda e: self._step(1))
+        listbox.bind('<Prior>', lambda e: self._step(-self.page))
+        listbox.bind('<Next>', lambda e: self._step(self.page))
+        for key in ('<Home>', '<Control-Home>'):
+            listbox.bind(key, lambda e: self._select(0))
+        for key in ('<End>', '<Control-End>'):
+            listbox.bind(key, lambda e: self._select(len(self.items) - 1))
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.offset = 0
+        self.current = None
+        self.render()
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.items) - self.page))
+        self.listbox.delete(0, END)
+        self.listbox.insert(END, *self.items[self.offset:self.offset + self.page])
+        if not self.items:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / len(self.items),
+                               min(1, (self.offset + self.page) / len(self.items)))
+        if self.current is not None and self.offset <= self.current < self.offset + self.page:
+            self.listbox.selection_set(self.current - self.offset)
+            self.listbox.activate(self.current - self.offset)
+
+    # Selected item from the full list, or None
+    def selected(self):
+        return self.items[self.current] if self.current is not None else None
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.current = self.offset + selection[0]
+
+    # Move the selection by delta rows, starting from the top visible row if none
+    def _step(self, delta):
+        return self._select(self.offset if self.current is None else self.current + delta)
+
+    # Select the item at index and scroll just far enough to show it
+    def _select(self, index):
+        if self.items:
+            self.current = max(0, min(index, len(self.items) - 1))
+            if self.current < self.offset:
+                self.offset = self.current
+            elif self.current >= self.offset + self.page:
+                self.offset = self.current - self.page + 1
+            self.render()
+        return "break"  # Skip the Listbox's own bindings, which only know the visible rows
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            step = self.page if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.render()
+
+    def _wheel(self, direction):
+        self.yview('scroll', direction * 3, 'units')
+        return "break"
+
+    def _on_resize(self, event):
+        page = max(1, event.height // self.row_height)
+        if page != self.page:
+            self.page = page
+            self.render()
+
+# Offline meal index: full meal records plus an inverted index from "field:word"
+# (fields: name, ingredient, category, area, tag) to meal ids, saved to INDEX_FILE.
+# Filled by crawling search.php?f=<letter>, one letter at a time
+class MealIndex:
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.meals = {}  # idMeal -> Meal
+        self.crawled = {}  # letter -> time it was last crawled
+        self.postings = {}  # "field:word" -> set of idMeal
+        self.keys = None  # Sorted postings keys for prefix lookups; None when stale
+        self.lock = threading.Lock()  # Crawls run on a worker while the Tk thread searches
+        self.load()
+
+    def __len__(self):
+        return len(self.meals)
+
+    @staticmethod
+    def words(text):
+        return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+    def meal_keys(self, meal):
+        keys = {f"name:{w}" for w in self.words(meal.name)}
+        for ingredient, measure in meal.ingredients:
+            keys.update(f"ingredient:{w}" for w in self.words(ingredient))
+        keys.update(f"category:{w}" for w in self.words(meal.category))
+        keys.update(f"area:{w}" for w in self.words(meal.area))
+        keys.update(f"tag:{w}" for w in self.words(meal.tags))
+        return keys
+
+    # Add or replace one meal
+    def add(self, meal):
+        with self.lock:
+            old = self.meals.get(meal.id)
+            if old:
+                for key in self.meal_keys(old):
+                    self.postings[key].discard(old.id)
+                    if not self.postings[key]:
+                        del self.postings[key]
+            self.meals[meal.id] = meal
+            for key in self.meal_keys(meal):
+                self.postings.setdefault(key, set()).add(meal.id)
+            self.keys = None
+
+    def _match(self, field, word, prefix):
+        if not prefix:
+            return self.postings.get(f"{field}:{word}", set())
+        if self.keys is None:
+            self.keys = sorted(self.postings)
+        start = f"{field}:{word}"
+        ids = set()
+        for key in self.keys[bisect.bisect_left(self.keys, start):]:
+            if not key.startswith(start):
+                break
+            ids |= self.postings[key]
+        return ids
+
+    # Meals matching every (mode='and') or any (mode='or') of the terms. Each term
+    # can be several words, all of which must match; words match as prefixes
+    def search(self, terms, field='name', mode='and', prefix=True):
+        with self.lock:
+            matches = []
+            for term in terms:
+                words = self.words(term)
+                if words:
+                    matches.append(set.intersection(*(self._match(field, w, prefix) for w in words)))
+            if not matches:
+                return []
+            ids = set.intersection(*matches) if mode == 'and' else set.union(*matches)
+            return sorted((self.meals[i] for i in ids), key=lambda m: m.name)
+
+    def random_meal(self):
+        with self.lock:
+            return random.choice(list(self.meals.values())) if self.meals else None
+
+    # Distinct category, area or ingredient names of the indexed meals, for browsing.
+    # Names differing only in case are listed once
+    def names(self, field):
+        with self.lock:
+            meals = list(self.meals.values())
+        if field == 'ingredient':
+            found = (ingredient for meal in meals for ingredient, measure in meal.ingredients)
+        else:
+            found = (getattr(meal, field) for meal in meals)
+        unique = {}
+        for name in found:
+            if name:
+                unique.setdefault(name.lower(), name)
+        return sorted(unique.values(), key=str.lower)
+
+    # Fetch every letter not crawled within max_age; returns the number of meals seen
+    def crawl(self, api, max_age=INDEX_MAX_AGE):
+        seen = 0
+        for letter in string.ascii_lowercase:
+            if time.time() - self.crawled.get(letter, 0) < max_age:
+                continue
+            for meal in parse_meals(api.get_json("search.php", f=letter)):
+                self.add(meal)
+                seen += 1
+            self.crawled[letter] = time.time()
+            self.save()  # Saved per letter so an interrupted crawl keeps its progress
+        return seen
+
+    def save(self):
+        with self.lock:
+            data = {'meals': [m.to_api() for m in self.meals.values()], 'crawled': self.crawled,
+                    'postings': {k: sorted(v) for k, v in self.postings.items()}}
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    # A missing, unreadable or wrongly shaped file leaves the index empty
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            meals = {m['idMeal']: Meal.from_api(m) for m in data['meals']}
+            crawled = dict(data['crawled'])
+            postings = {k: set(v) for k, v in data['postings'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        if any(not ids <= meals.keys() for ids in postings.values()):
+            return  # search() would fail on the missing meals
+        self.meals, self.crawled, self.postings = meals, crawled, postings
+
+# Token bucket: lets bursts of up to `burst` calls through, then `rate` per second.
+# Callers reserve a token and sleep off any debt, so waiting calls go out in order
+class RateLimiter:
+    def __init__(self, rate=API_RATE, burst=API_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    # Take a token, waiting for one if needed; returns the seconds waited
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+# Shared HTTP client: every request goes through one pooled keep-alive session,
+# so repeat calls reuse open connections instead of a new TCP+TLS handshake each time
+class MealAPI:
+    def __init__(self, base_url=API_BASE, pool_size=10, retries=3, backoff=0.5, timeout=10, cache=None,
+                 rate=API_RATE, burst=API_BURST):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = RateLimiter(rate, burst) if rate else None
+        self.inflight = {}  # cache key -> Future shared by every caller waiting on that request
+        self.lock = threading.Lock()
+        self.stats = {'calls': 0, 'network': 0, 'cache_hits': 0, 'deduplicated': 0, 'throttled': 0}
+        self.session = requests.Session()
+        # Retry connection errors and transient server errors with exponential backoff
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # Cache key: endpoint plus sorted, trimmed, lower-cased parameters, so
+    # "?s=Chicken " and "?s=chicken" share one entry
+    @staticmethod
+    def cache_key(endpoint, params):
+        return endpoint + "?" + urlencode(sorted((k, str(v).strip().lower()) for k, v in params.items()))
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    # GET an API endpoint such as "search.php" and return the decoded JSON. Callers
+    # asking for the same thing at the same time share one request
+    def get_json(self, endpoint, **params):
+        key = self.cache_key(endpoint, params)
+        self.count('calls')
+        if endpoint in UNSHARED_ENDPOINTS:
+            return json.loads(self.fetch_body(endpoint, key, params))
+        
+        # Decoded per caller so nobody shares mutable results
+        return json.loads(self.single_flight(key, lambda: self.fetch_body(endpoint, key, params)))
+
+    # Run fetch() for key, unless another thread is already doing so; then wait for
+    # and share its result (or its error)
+    def single_flight(self, key, fetch):
+        with self.lock:
+            shared = self.inflight.get(key)
+            leader = shared is None
+            if leader:
+                shared = self.inflight[key] = Future()
+            else:
+                self.stats['deduplicated'] += 1
+        if leader:
+            try:
+                shared.set_result(fetch())
+            except Exception as e:
+                shared.set_exception(e)
+            finally:
+                with self.lock:
+                    del self.inflight[key]
+        return shared.result()
+
+    # Wait for a rate-limit token before going to the network
+    def throttle(self):
+        if self.limiter and self.limiter.acquire():
+            self.count('throttled')
+        self.count('network')
+
+    # Response body for one request. Fresh cached responses skip the network; stale ones
+    # are revalidated with ETag/Last-Modified
+    def fetch_body(self, endpoint, key, params):
+        ttl = CACHE_TTLS.get(endpoint, 0) if self.cache else 0
+        entry = self.cache.get(key) if ttl else None
+        if entry and time.time() - entry[0] < ttl:
+            self.count('cache_hits')
+            return entry[3]
+
+        self.throttle()
+        headers = {}
+        if entry and entry[1]: headers['If-None-Match'] = entry[1]
+        if entry and entry[2]: headers['If-Modified-Since'] = entry[2]
+        response = self.session.get(self.base_url + endpoint, params=params, headers=headers,
+                                    timeout=self.timeout)
+        if response.status_code == 304 and entry:
+            self.cache.put(key, (time.time(), entry[1], entry[2], entry[3]))
+            return entry[3]
+        response.raise_for_status()
+        if ttl:
+            self.cache.put(key, (time.time(), response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), response.content))
+        return response.content
+
+    # GET raw bytes from an absolute URL (meal images). Shares in-flight downloads and
+    # the rate limit with get_json, so prefetch and the image pane fetch a thumbnail once
+    def get_bytes(self, url):
+        self.count('calls')
+        
+        def fetch():
+            self.throttle()
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
+        
+        return self.single_flight("url:" + url, fetch)
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
 
 class MealApp:
-    def __init__(self, root):
+    def __init__(self, root, api=None):
         self.root = root
         self.root.title("The Meal Application")
         self.root.geometry("1000x700")
@@ -16,10 +583,41 @@ class MealApp:
         self.categories = []
         self.areas = []
         self.ingredients = []
+        self.api = api or MealAPI(cache=self.open_cache())
+        self.thumbs = ThumbnailCache(self.api)
+        self.photos = OrderedDict()  # image URL -> PhotoImage, least recently shown first
+        self.index = MealIndex()
+        self.offline = BooleanVar(value=False)
+        
+        # Network calls run on a thread pool; results come back through a queue
+        # that the Tk thread drains with after(), so the mainloop never blocks
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mealdb")
+        self.done_queue = queue.Queue()
+        self.latest = {}  # channel -> (token, future) of the newest request on that channel
+        self.request_count = 0
+        self.search_job = None  # after() id of a debounced search
+        self.typed = QueryTrie()
+        self.last_typed = ""
+        
+        # Prefetching of details and thumbnails for results the user is likely to open
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        self.prefetch_gen = 0  # Bumped whenever the result list is replaced
+        self.prefetch_futures = []
+        self.prefetched = set()  # idMeal values already prefetched in this generation
+        self.prefetch_job = None
         
         # Setup the GUI
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.poll_done()
     
+    # Persistent response cache, falling back to memory only if the file can't be opened
+    def open_cache(self):
+        try:
+            return ResponseCache(CACHE_FILE)
+        except sqlite3.Error:
+            return ResponseCache(":memory:")
+
     def create_widgets(self):
         # Top title
         title = Label(self.root, text="DISH DISCOVERY", 
@@ -51,12 +649,17 @@ class MealApp:
         
         self.search_entry = Entry(entry_frame, width=35, font=("Arial", 10))
         self.search_entry.pack(side=LEFT, padx=5)
-        self.search_entry.bind('<Return>', lambda e: self.search_meals())
+        self.search_entry.bind('<Return>', lambda e: self.schedule_search())
+        self.search_entry.bind('<KeyRelease>', self.on_type)
         
         Button(entry_frame, text="Search", command=self.search_meals, fg="black", width=10).pack(side=LEFT, padx=3)
         Button(entry_frame, text="Random", command=self.get_random, fg="black", width=10).pack(side=LEFT, padx=3)
         Button(entry_frame, text="Clear", command=self.clear_all, fg="black", width=10).pack(side=LEFT, padx=3)
         
+        # Offline search against the local index
+        Checkbutton(entry_frame, text="Offline", variable=self.offline, bg="white").pack(side=LEFT, padx=3)
+        Button(entry_frame, text="Update Index", command=self.update_index, fg="black", width=12).pack(side=LEFT, padx=3)
+        
         # Browse buttons
         browse_frame = Frame(search_frame, bg="white")
         browse_frame.pack(pady=5)
@@ -81,7 +684,11 @@ class MealApp:
         list_scroll = Scrollbar(left_frame)
         list_scroll.pack(side=RIGHT, fill=Y)
         
-        self.results_listbox = Listbox(left_frame, font=("Arial", 10), yscrollcommand=list_scroll.set)
+        def on_results_scroll(first, last):
+            list_scroll.set(first, last)
+            self.schedule_prefetch()
+        
+        self.results_listbox = Listbox(left_frame, font=("Arial", 10), yscrollcommand=on_results_scroll)
         self.results_listbox.pack(fill=BOTH, expand=True, padx=5, pady=5)
         list_scroll.config(command=self.results_listbox.yview)
         
@@ -110,53 +717,241 @@ class MealApp:
         self.status_label = Label(self.root, text="Ready", anchor=W, bg="#e0e0e0", font=("Arial", 9))
         self.status_label.pack(side=BOTTOM, fill=X)
     
-    # Search meals function
-    def search_meals(self):
+    # Run fn() on the pool and hand its result to on_done (or the exception to on_error)
+    # on the Tk thread. A newer request on the same channel supersedes this one: it is
+    # cancelled if it hasn't started, and its result is dropped if it has
+    def fetch(self, channel, fn, on_done, on_error=None):
+        self.request_count += 1
+        token = self.request_count
+        previous = self.latest.get(channel)
+        if previous:
+            previous[1].cancel()
+        future = self.pool.submit(fn)
+        self.latest[channel] = (token, future)
+        future.add_done_callback(lambda f: self.done_queue.put((channel, token, f, on_done, on_error)))
+    
+    # Cancel whatever is pending on a channel
+    def cancel(self, channel):
+        previous = self.latest.pop(channel, None)
+        if previous:
+            previous[1].cancel()
+    
+    def poll_done(self):
+        try:
+            while True:
+                try:
+                    channel, token, future, on_done, on_error = self.done_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if future.cancelled():
+                    continue
+                if channel is not None:
+                    latest = self.latest.get(channel)
+                    if not latest or latest[0] != token:
+                        continue  # Superseded
+                    del self.latest[channel]
+                # A failing handler is reported and must not stop later results arriving
+                try:
+                    error = future.exception()
+                    if error is None:
+                        on_done(future.result())
+                    elif on_error:
+                        on_error(error)
+                except Exception as e:
+                    self.show_error("Failed to show the result", e)
+        finally:
+            self.root.after(30, self.poll_done)
+    
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    # Prefetch details and thumbnails for the results in view and those around the
+    # selection, so opening them (or arrowing through them) needs no network wait
+    def schedule_prefetch(self):
+        if not self.prefetch_job:
+            self.prefetch_job = self.root.after(100, self.prefetch_visible)
+    
+    def prefetch_visible(self):
+        self.prefetch_job = None
+        listbox = self.results_listbox
+        wanted = list(range(listbox.nearest(0), listbox.nearest(listbox.winfo_height()) + 1))
+        for index in listbox.curselection():
+            wanted += range(index - PREFETCH_AROUND, index + PREFETCH_AROUND + 1)
+        for index in wanted:
+            if 0 <= index < len(self.current_meals):
+                self.prefetch(index)
+    
+    def prefetch(self, index):
+        meal = self.current_meals[index]
+        meal_id = meal.id
+        if meal_id in self.prefetched:
+            return
+        self.prefetched.add(meal_id)
+        gen = self.prefetch_gen
+        offline = self.offline.get()
+        
+        # Offline, details come from the index and only cached thumbnails are read
+        def work():
+            full = meal
+            if meal.instructions is None:
+                if offline:
+                    full = self.index.meals.get(meal_id, meal)
+                else:
+                    found = parse_meals(self.api.get_json("lookup.php", i=meal_id))
+                    full = found[0] if found else meal
+            url = full.thumb
+            if not url or url in self.photos:
+                return full, None
+            try:
+                return full, self.thumbs.load(url, download=not offline)
+            except OSError:
+                if not offline:
+                    raise
+                return full, None
+        
+        def done(result):
+            if gen != self.prefetch_gen:
+                return  # Results were replaced meanwhile
+            full, img = result
+            if index < len(self.current_meals) and self.current_meals[index] is meal:
+                self.current_meals[index] = full
+            if img is not None and full.thumb not in self.photos:
+                self.remember_photo(full.thumb, ImageTk.PhotoImage(img))
+        
+        def failed(error):
+            if gen == self.prefetch_gen:
+                self.prefetched.discard(meal_id)  # Allow a later retry
+        
+        # The pool's worker count bounds how many prefetches are in flight
+        future = self.prefetch_pool.submit(work)
+        self.prefetch_futures.append(future)
+        future.add_done_callback(lambda f: self.done_queue.put((None, None, f, done, failed)))
+    
+    # Drop queued prefetches for a result list that is being replaced
+    def reset_prefetch(self):
+        self.prefetch_gen += 1
+        for future in self.prefetch_futures:
+            future.cancel()
+        self.prefetch_futures = []
+        self.prefetched = set()
+    
+    # Debounce <Return>: only the last press within SEARCH_DEBOUNCE_MS starts a search
+    def schedule_search(self, live=False):
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, lambda: self.search_meals(live))
+    
+    # Search as the user types. Only name and offline searches match partial words;
+    # the API's ingredient, category and area filters need the whole name
+    def on_type(self, event):
+        query = self.search_entry.get().strip()
+        if query == self.last_typed:
+            return
+        self.last_typed = query
+        if len(query) >= TYPEAHEAD_MIN_CHARS and (self.offline.get() or self.search_type.get() == "name"):
+            self.schedule_search(live=True)
+    
+    # Search meals function. Live searches come from typing and stay quiet when
+    # nothing matches
+    def search_meals(self, live=False):
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        
         query = self.search_entry.get().strip()
         
         if not query:
-            messagebox.showwarning("Empty Search", "Please enter something to search!")
+            if not live:
+                messagebox.showwarning("Empty Search", "Please enter something to search!")
             return
         
         search_type = self.search_type.get()
         
-        # Build the API URL based on search type
+        if self.offline.get():
+            self.search_offline(query, search_type, live)
+            return
+        
+        # Pick the API endpoint and parameter based on search type
         if search_type == "name":
-            url = f"https://www.themealdb.com/api/json/v1/1/search.php?s={query}"
+            key = query.lower()
+            prefix, meals = self.typed.longest_prefix(key)
+            if prefix is not None:
+                if prefix != key:
+                    meals = [m for m in meals if key in m.name.lower()]
+                    self.typed.insert(key, meals)
+                self.cancel('results')
+                self.show_search_results(meals, live)
+                return
+            
+            def got_results(meals):
+                self.typed.insert(key, meals)
+                self.show_search_results(meals, live)
+            
+            self.status_label.config(text="Searching...")
+            self.fetch('results', lambda: parse_meals(self.api.get_json("search.php", s=query)),
+                       got_results, lambda e: self.show_error("Failed to search", e))
+            return
         elif search_type == "ingredient":
-            url = f"https://www.themealdb.com/api/json/v1/1/filter.php?i={query}"
+            endpoint, params = "filter.php", {'i': query}
         elif search_type == "category":
-            url = f"https://www.themealdb.com/api/json/v1/1/filter.php?c={query}"
+            endpoint, params = "filter.php", {'c': query}
         elif search_type == "area":
-            url = f"https://www.themealdb.com/api/json/v1/1/filter.php?a={query}"
+            endpoint, params = "filter.php", {'a': query}
         
         self.status_label.config(text="Searching...")
-        self.root.update()
-        
-        try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if data['meals']:
-                self.current_meals = data['meals']
-                self.display_results()
-                self.status_label.config(text=f"Found {len(self.current_meals)} results")
-            else:
-                self.current_meals = []
-                self.results_listbox.delete(0, END)
-                self.status_label.config(text="No results found")
+        self.fetch('results', lambda: parse_meals(self.api.get_json(endpoint, **params)),
+                   lambda meals: self.show_search_results(meals, live),
+                   lambda e: self.show_error("Failed to search", e))
+    
+    # Search the local index: "a, b" needs every term, "a | b" needs any of them
+    def search_offline(self, query, search_type, live=False):
+        if not len(self.index):
+            if not live:
+                self.index_empty()
+            return
+        self.cancel('results')
+        mode = 'or' if '|' in query else 'and'
+        terms = re.split(r"[|,]", query)
+        start = time.perf_counter()
+        meals = self.index.search(terms, field=search_type, mode=mode)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.show_search_results(meals, live)
+        if meals:
+            self.status_label.config(text=f"Found {len(meals)} results offline in {elapsed:.1f} ms")
+    
+    def index_empty(self):
+        messagebox.showinfo("Offline Index", "The offline index is empty. Click 'Update Index' while online.")
+    
+    # Crawl any letters missing from the offline index in the background
+    def update_index(self):
+        self.status_label.config(text="Updating offline index...")
+        self.fetch('crawl', lambda: self.index.crawl(self.api),
+                   lambda n: self.status_label.config(text=f"Offline index: {len(self.index)} meals ({n} fetched)"),
+                   lambda e: self.show_error("Failed to update offline index", e))
+    
+    def show_search_results(self, meals, live=False):
+        if meals:
+            self.current_meals = meals
+            self.display_results()
+            self.status_label.config(text=f"Found {len(self.current_meals)} results")
+        else:
+            self.current_meals = []
+            self.results_listbox.delete(0, END)
+            self.status_label.config(text="No results found")
+            if not live:
                 messagebox.showinfo("No Results", "No meals found for your search")
-        
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to search: {str(e)}")
-            self.status_label.config(text="Error occurred")
+    
+    def show_error(self, message, error):
+        messagebox.showerror("Error", f"{message}: {str(error)}")
+        self.status_label.config(text="Error occurred")
     
     # Display search results in listbox
     def display_results(self):
+        self.reset_prefetch()
         self.results_listbox.delete(0, END)
-        
-        for meal in self.current_meals:
-            self.results_listbox.insert(END, meal['strMeal'])
+        self.results_listbox.insert(END, *(meal.name for meal in self.current_meals))
     
     # Show meal details when selected
     def show_details(self, event):
@@ -164,34 +959,45 @@ class MealApp:
         
         if not selection:
             return
+        self.schedule_prefetch()
         
         index = selection[0]
         meal = self.current_meals[index]
         
-        # Get full meal details if needed
-        if 'strInstructions' not in meal:
-            meal_id = meal['idMeal']
-            url = f"https://www.themealdb.com/api/json/v1/1/lookup.php?i={meal_id}"
+        # Get full meal details if needed, then keep them for the next selection.
+        # Offline, the index's copy is used when it has one
+        if meal.instructions is None and self.offline.get():
+            self.cancel('details')
+            full = self.index.meals.get(meal.id, meal)
+            self.current_meals[index] = full
+            self.display_meal(full)
+        elif meal.instructions is None:
+            def got_details(found):
+                full = found[0] if found else meal
+                if index < len(self.current_meals) and self.current_meals[index] is meal:
+                    self.current_meals[index] = full
+                self.display_meal(full)
             
-            try:
-                response = requests.get(url, timeout=10)
-                data = response.json()
-                meal = data['meals'][0]
-            except:
-                pass
-        
+            self.fetch('details', lambda: parse_meals(self.api.get_json("lookup.php", i=meal.id)),
+                       got_details, lambda e: self.display_meal(meal))
+        else:
+            self.cancel('details')
+            self.display_meal(meal)
+    
+    # Fill the details pane for one meal
+    def display_meal(self, meal):
         # Clear previous details
         self.details_text.delete(1.0, END)
         
         # Display meal information
-        self.details_text.insert(END, f"{meal['strMeal']}\n\n", "title")
+        self.details_text.insert(END, f"{meal.name}\n\n", "title")
         self.details_text.tag_config("title", font=("Arial", 13, "bold"))
         
-        self.details_text.insert(END, f"Category: {meal.get('strCategory', 'N/A')}\n")
-        self.details_text.insert(END, f"Area: {meal.get('strArea', 'N/A')}\n")
+        self.details_text.insert(END, f"Category: {meal.category or 'N/A'}\n")
+        self.details_text.insert(END, f"Area: {meal.area or 'N/A'}\n")
         
-        if meal.get('strTags'):
-            self.details_text.insert(END, f"Tags: {meal['strTags']}\n")
+        if meal.tags:
+            self.details_text.insert(END, f"Tags: {meal.tags}\n")
         
         self.details_text.insert(END, "\n")
         
@@ -199,55 +1005,59 @@ class MealApp:
         self.details_text.insert(END, "Ingredients:\n", "bold")
         self.details_text.tag_config("bold", font=("Arial", 10, "bold"))
         
-        for i in range(1, 21):
-            ingredient = meal.get(f'strIngredient{i}')
-            measure = meal.get(f'strMeasure{i}')
-            
-            if ingredient and ingredient.strip():
-                self.details_text.insert(END, f"  • {measure} {ingredient}\n")
+        for ingredient, measure in meal.ingredients:
+            self.details_text.insert(END, f"  • {measure} {ingredient}\n")
         
         # Show instructions
-        if meal.get('strInstructions'):
+        if meal.instructions:
             self.details_text.insert(END, f"\nInstructions:\n", "bold")
-            self.details_text.insert(END, f"{meal['strInstructions']}\n\n")
+            self.details_text.insert(END, f"{meal.instructions}\n\n")
         
         # Show source link
-        if meal.get('strSource'):
-            self.details_text.insert(END, f"Source: {meal['strSource']}\n")
+        if meal.source:
+            self.details_text.insert(END, f"Source: {meal.source}\n")
         
         # Load and show image
-        if meal.get('strMealThumb'):
-            self.load_image(meal['strMealThumb'])
+        if meal.thumb:
+            self.load_image(meal.thumb)
+        else:
+            self.cancel('image')
     
-    # Load meal image
+    # Load meal image. Recently shown images come straight from the PhotoImage LRU;
+    # otherwise the thumbnail is read or downloaded and decoded on the pool, and only
+    # the PhotoImage is created on the Tk thread. Offline, only cached thumbnails show
     def load_image(self, image_url):
-        try:
-            response = requests.get(image_url, timeout=10)
-            img_data = response.content
-            
-            img = Image.open(BytesIO(img_data))
-            img = img.resize((220, 220))
-            
+        photo = self.photos.get(image_url)
+        if photo:
+            self.cancel('image')
+            self.photos.move_to_end(image_url)
+            self.show_photo(photo)
+            return
+        
+        def show_image(img):
             photo = ImageTk.PhotoImage(img)
-            
-            self.image_label.config(image=photo, text="")
-            self.image_label.image = photo
+            self.remember_photo(image_url, photo)
+            self.show_photo(photo)
         
-        except Exception as e:
-            self.image_label.config(image='', text="Image not available")
+        download = not self.offline.get()
+        self.fetch('image', lambda: self.thumbs.load(image_url, download), show_image,
+                   lambda e: self.image_label.config(image='', text="Image not available"))
+    
+    def remember_photo(self, image_url, photo):
+        self.photos[image_url] = photo
+        if len(self.photos) > PHOTO_CACHE_SIZE:
+            self.photos.popitem(last=False)
+    
+    def show_photo(self, photo):
+        self.image_label.config(image=photo, text="")
+        self.image_label.image = photo
     
     # Get random meal
     def get_random(self):
-        url = "https://www.themealdb.com/api/json/v1/1/random.php"
-        
         self.status_label.config(text="Getting random meal...")
-        self.root.update()
         
-        try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            self.current_meals = data['meals']
+        def got_random(meals):
+            self.current_meals = meals
             self.display_results()
             
             # Auto-select and show details
@@ -256,54 +1066,67 @@ class MealApp:
             
             self.status_label.config(text="Random meal loaded!")
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to get random meal: {str(e)}")
-            self.status_label.config(text="Error occurred")
+        if self.offline.get():
+            meal = self.index.random_meal()
+            if meal is None:
+                self.index_empty()
+                return
+            self.cancel('results')
+            got_random([meal])
+            return
+        self.fetch('results', lambda: parse_meals(self.api.get_json("random.php")), got_random,
+                   lambda e: self.show_error("Failed to get random meal", e))
     
     # Browse categories
     def browse_categories(self):
-        url = "https://www.themealdb.com/api/json/v1/1/categories.php"
+        if self.offline.get():
+            self.browse_offline("Categories", 'strCategory', 'category')
+            return
         
-        try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
+        def got_categories(data):
             if data['categories']:
                 self.categories = data['categories']
                 self.show_browse_window("Categories", self.categories, 'strCategory', 'category')
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load categories: {str(e)}")
+        self.fetch('browse', lambda: self.api.get_json("categories.php"), got_categories,
+                   lambda e: messagebox.showerror("Error", f"Failed to load categories: {str(e)}"))
     
     # Browse areas
     def browse_areas(self):
-        url = "https://www.themealdb.com/api/json/v1/1/list.php?a=list"
+        if self.offline.get():
+            self.browse_offline("Areas", 'strArea', 'area')
+            return
         
-        try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
+        def got_areas(data):
             if data['meals']:
                 self.areas = data['meals']
                 self.show_browse_window("Areas", self.areas, 'strArea', 'area')
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load areas: {str(e)}")
+        self.fetch('browse', lambda: self.api.get_json("list.php", a="list"), got_areas,
+                   lambda e: messagebox.showerror("Error", f"Failed to load areas: {str(e)}"))
     
     # Browse ingredients
     def browse_ingredients(self):
-        url = "https://www.themealdb.com/api/json/v1/1/list.php?i=list"
+        if self.offline.get():
+            self.browse_offline("Ingredients", 'strIngredient', 'ingredient')
+            return
         
-        try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
+        def got_ingredients(data):
             if data['meals']:
-                self.ingredients = data['meals'][:100]  # First 100 ingredients
+                self.ingredients = data['meals']
                 self.show_browse_window("Ingredients", self.ingredients, 'strIngredient', 'ingredient')
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load ingredients: {str(e)}")
+        self.fetch('browse', lambda: self.api.get_json("list.php", i="list"), got_ingredients,
+                   lambda e: messagebox.showerror("Error", f"Failed to load ingredients: {str(e)}"))
+    
+    # Browse names taken from the offline index instead of the API's list endpoints
+    def browse_offline(self, title, key, search_type):
+        names = self.index.names(search_type)
+        if not names:
+            self.index_empty()
+            return
+        self.cancel('browse')
+        self.show_browse_window(title, [{key: name} for name in names], key, search_type)
     
     # Show browse window
     def show_browse_window(self, title, items, key, search_type):
@@ -314,23 +1137,32 @@ class MealApp:
         
         Label(window, text=f"Select {title[:-1]}:", font=("Arial", 12, "bold"), bg="white").pack(pady=10)
         
-        # Listbox to show items
+        # Filter box narrows the list as you type
+        names = [item[key] for item in items if item[key]]
+        lowered = [name.lower() for name in names]
+        filter_entry = Entry(window, font=("Arial", 10))
+        filter_entry.pack(fill=X, padx=10)
+        
+        # Only the visible rows live in the listbox, so long lists open instantly
         scroll = Scrollbar(window)
         scroll.pack(side=RIGHT, fill=Y)
         
-        listbox = Listbox(window, font=("Arial", 10), yscrollcommand=scroll.set)
+        listbox = Listbox(window, font=("Arial", 10))
         listbox.pack(fill=BOTH, expand=True, padx=10, pady=10)
-        scroll.config(command=listbox.yview)
+        rows = VirtualList(listbox, scroll)
+        rows.set_items(names)
+        
+        def apply_filter(event):
+            text = filter_entry.get().strip().lower()
+            rows.set_items([name for name, low in zip(names, lowered) if text in low])
         
-        # Populate listbox
-        for item in items:
-            listbox.insert(END, item[key])
+        filter_entry.bind('<KeyRelease>', apply_filter)
+        filter_entry.focus_set()
         
         # Select button
         def select_item():
-            selection = listbox.curselection()
-            if selection:
-                selected = listbox.get(selection[0])
+            selected = rows.selected()
+            if selected:
                 self.search_type.set(search_type)
                 self.search_entry.delete(0, END)
                 self.search_entry.insert(0, selected)
@@ -343,15 +1175,161 @@ class MealApp:
     
     # Clear everything
     def clear_all(self):
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        for channel in ('results', 'details', 'image'):
+            self.cancel(channel)
+        self.reset_prefetch()
         self.search_entry.delete(0, END)
+        self.last_typed = ""
         self.results_listbox.delete(0, END)
         self.details_text.delete(1.0, END)
         self.image_label.config(image='', text="Select a meal to view")
         self.current_meals = []
         self.status_label.config(text="Cleared")
 
+# Local stand-in for TheMealDB used by the benchmark: answers every path with a small
+# JSON body over HTTP/1.1 keep-alive, after a fixed delay per new connection to
+# stand in for the TCP+TLS handshake a real HTTPS server costs
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+    handshake_delay = 0.02
+    body = json.dumps({'meals': [{'idMeal': '52772', 'strMeal': 'Teriyaki Chicken Casserole'}]}).encode()
+
+    def setup(self):
+        time.sleep(self.handshake_delay)
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+# Benchmark: latency per request with a fresh connection each time vs the pooled session
+def benchmark_api(requests_count=50):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/api/json/v1/1/"
+    try:
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            requests.get(base + "lookup.php", params={'i': '52772'}, timeout=10).json()
+        bare = (time.perf_counter() - start) / requests_count * 1000
+
+        api = MealAPI(base_url=base, rate=None)
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            api.get_json("lookup.php", i="52772")
+        pooled = (time.perf_counter() - start) / requests_count * 1000
+        api.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(f"requests.get per call: {bare:.2f} ms")
+    print(f"pooled session:        {pooled:.2f} ms")
+    print(f"saved per request:     {bare - pooled:.2f} ms "
+          f"(stand-in handshake delay {StandInHandler.handshake_delay * 1000:.0f} ms)")
+
+# Benchmark: a burst like a user clicking around quickly. Eight callers at a time ask
+# for the same meal, then thirty distinct lookups go out, all through one limiter
+def benchmark_burst(rate=20, burst=5):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api = MealAPI(base_url=f"http://127.0.0.1:{server.server_port}/api/json/v1/1/", rate=rate, burst=burst)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for meal_id in range(5):
+                list(pool.map(lambda _: api.get_json("lookup.php", i=str(meal_id)), range(8)))
+            list(pool.map(lambda i: api.get_json("lookup.php", i=str(100 + i)), range(30)))
+        elapsed = time.perf_counter() - start
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    stats = api.stats
+    print(f"{stats['calls']} calls -> {stats['network']} requests in {elapsed:.2f} s "
+          f"(limit {rate}/s, burst {burst})")
+    print(f"deduplicated: {stats['deduplicated']}, throttled: {stats['throttled']}")
+
+# TheMealDB-shaped lookup records for benchmarks: every key the API sends, with
+# 8-14 ingredients used and the rest empty as in real responses
+def sample_records(count):
+    categories = ["Beef", "Chicken", "Dessert", "Lamb", "Pasta", "Seafood", "Vegetarian"]
+    areas = ["British", "Indian", "Italian", "Japanese", "Mexican", "Thai"]
+    ingredients = [f"Ingredient {i}" for i in range(600)]
+    records = []
+    for i in range(count):
+        used = 8 + i % 7
+        record = {'idMeal': str(52000 + i), 'strMeal': f"Meal number {i}", 'strDrinkAlternate': None,
+                  'strCategory': categories[i % len(categories)], 'strArea': areas[i % len(areas)],
+                  'strInstructions': "Stir and simmer gently. " * 40, 'strTags': "Dinner,Easy",
+                  'strMealThumb': f"https://www.themealdb.com/images/media/meals/{i}.jpg",
+                  'strYoutube': f"https://www.youtube.com/watch?v={i}"}
+        for n in range(1, 21):
+            record[f'strIngredient{n}'] = ingredients[(i * 7 + n) % 600] if n <= used else ""
+            record[f'strMeasure{n}'] = f"{n * 25}g" if n <= used else " "
+        record.update({'strSource': None, 'strImageSource': None,
+                       'strCreativeCommonsConfirmed': None, 'dateModified': None})
+        records.append(record)
+    return records
+
+# Benchmark: memory held by cached meals as raw API dicts vs Meal objects, and the
+# time to list every meal's ingredients the way the details pane does
+def benchmark_meals(count=3000):
+    payload = json.dumps({'meals': sample_records(count)})  # Parsed fresh, as from the network
+    
+    tracemalloc.start()
+    raw = json.loads(payload)['meals']
+    raw_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    tracemalloc.start()
+    meals = parse_meals(json.loads(payload))
+    meal_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for meal in raw:
+        for i in range(1, 21):
+            ingredient = meal.get(f'strIngredient{i}')
+            measure = meal.get(f'strMeasure{i}')
+            if ingredient and ingredient.strip():
+                f"{measure} {ingredient}"
+    raw_walk = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    for meal in meals:
+        for ingredient, measure in meal.ingredients:
+            f"{measure} {ingredient}"
+    meal_walk = (time.perf_counter() - start) * 1000
+    
+    print(f"{count} meals as API dicts: {raw_bytes / 1024:8.0f} KiB, ingredient walk {raw_walk:6.1f} ms")
+    print(f"{count} meals as Meal:      {meal_bytes / 1024:8.0f} KiB, ingredient walk {meal_walk:6.1f} ms")
+
 # Main program
 if __name__ == "__main__":
-    root = Tk()
-    app = MealApp(root)
-    root.mainloop()
\ No newline at end of file
+    if "--bench-api" in sys.argv:
+        benchmark_api()
+    elif "--bench-burst" in sys.argv:
+        benchmark_burst()
+    elif "--bench-memory" in sys.argv:
+        benchmark_meals()
+    elif "--build-index" in sys.argv:
+        index = MealIndex()
+        api = MealAPI(cache=ResponseCache(CACHE_FILE))
+        fetched = index.crawl(api)
+        api.close()
+        print(f"Offline index: {len(index)} meals ({fetched} fetched) -> {INDEX_FILE}")
+        print(f"API calls: {api.stats}")
+    else:
+        root = Tk()
+        app = MealApp(root)
+        root.mainloop()
\ No newline at end of file